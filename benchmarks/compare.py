@@ -0,0 +1,63 @@
+"""
+Compare two gas benchmark reports written by benchmarks/test_gas_benchmark.py.
+
+    python benchmarks/compare.py old.json new.json [--threshold 0.02]
+
+Exits with status 1 when any batch function uses more than `threshold` (relative) extra gas for a cohort size that was
+measured in both reports, when a cohort size that was measured in the old report no longer fits in a block, or when a
+function or cohort size of the old report is missing from the new one.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+MISSING = "missing"
+
+
+def compare(old: dict, new: dict, threshold: float) -> [tuple]:
+    rows = []
+    for name in sorted(set(old["results"]) | set(new["results"])):
+        old_sizes, new_sizes = old["results"].get(name, {}), new["results"].get(name)
+        for size in sorted(set(old_sizes) | set(new_sizes or {}), key=int):
+            old_gas = old_sizes[size].get("gas_used") if size in old_sizes else MISSING
+            if new_sizes is None or size not in new_sizes:
+                rows.append((name, int(size), old_gas, MISSING, None, True))
+                continue
+            new_gas = new_sizes[size].get("gas_used")
+            if old_gas in (None, MISSING) or new_gas is None:
+                # A size that used to be measured and now reverts or runs out of gas is a regression.
+                rows.append((name, int(size), old_gas, new_gas, None, old_gas not in (None, MISSING)))
+                continue
+            change = (new_gas - old_gas) / old_gas
+            rows.append((name, int(size), old_gas, new_gas, change, change > threshold))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("old")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=0.02,
+                        help="relative gas increase that counts as a regression (default: 0.02)")
+    args = parser.parse_args(argv)
+
+    old, new = load(args.old), load(args.new)
+    print(f"{'function':<22}{'users':>7}{'old gas':>14}{'new gas':>14}{'change':>10}")
+    regressions = 0
+    for name, size, old_gas, new_gas, change, regressed in compare(old, new, args.threshold):
+        change_str = "n/a" if change is None else f"{change:+.2%}"
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<22}{size:>7}{str(old_gas):>14}{str(new_gas):>14}{change_str:>10}{flag}")
+        regressions += regressed
+    print(f"\n{old.get('commit')} -> {new.get('commit')}: {regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
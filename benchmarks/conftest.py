@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Reuse the deployment helpers from the test suite (`base.BaseTest`, `utils`).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
@@ -0,0 +1,159 @@
+"""
+Run the stateful suite (tests/test_stateful_yiedl.py) in parallel shards, each against its own local dev chain.
+
+    python benchmarks/run_stateful_sharded.py --shards 8 --examples 320 [--cmd ganache-cli] [--base-port 8600]
+        [--database ~/.brownie/hypothesis]
+
+Brownie's xdist scheduling keeps a test file on one worker, so the single stateful test cannot be split that way.
+Instead every shard is a separate `brownie test` process:
+- it runs on a development network with its own port, registered with `brownie networks add` for the run;
+- it gets its own Hypothesis seed and an equal share of `--examples`;
+- it works on a copy of brownie's Hypothesis example database, so saved failures are replayed in every shard.
+
+After all shards finish, their example databases are merged back into brownie's database (`~/.brownie/hypothesis`,
+which every `brownie test` run reads) and their outcomes and Hypothesis statistics are summarised. Exits with status 1
+if any shard failed.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ElementTree
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST = "tests/test_stateful_yiedl.py"
+
+
+def default_database() -> str:
+    """The example database brownie configures for `brownie test` (`_modify_hypothesis_settings`)."""
+    from brownie._config import _get_data_folder
+    return str(_get_data_folder().joinpath("hypothesis"))
+
+
+def network_id(shard: int) -> str:
+    return f"yiedl-shard-{shard}"
+
+
+def add_networks(shards: int, base_port: int, cmd: str):
+    for shard in range(shards):
+        subprocess.run(["brownie", "networks", "delete", network_id(shard)], cwd=ROOT, capture_output=True)
+        subprocess.run(["brownie", "networks", "add", "Development", network_id(shard), f"cmd={cmd}",
+                        "host=http://127.0.0.1", f"port={base_port + shard}", "accounts=10", "mnemonic=brownie",
+                        "evm_version=istanbul"], cwd=ROOT, check=True, capture_output=True)
+
+
+def delete_networks(shards: int):
+    for shard in range(shards):
+        subprocess.run(["brownie", "networks", "delete", network_id(shard)], cwd=ROOT, capture_output=True)
+
+
+def seed_database(source: str, target: str):
+    """Start a shard's example database from a copy of `source`."""
+    if os.path.isdir(source):
+        shutil.copytree(source, target)
+    else:
+        os.makedirs(target)
+
+
+def merge_databases(sources: list, target: str) -> int:
+    """Copy every example in `sources` into `target`; return the number of new examples."""
+    # DirectoryBasedExampleDatabase stores each example as `<key hash>/<value hash>`, so a merge is a union of files.
+    added = 0
+    for source in sources:
+        for directory, _, files in os.walk(source):
+            relative = os.path.relpath(directory, source)
+            for name in files:
+                destination = os.path.join(target, relative, name)
+                if not os.path.exists(destination):
+                    os.makedirs(os.path.dirname(destination), exist_ok=True)
+                    shutil.copyfile(os.path.join(directory, name), destination)
+                    added += 1
+    return added
+
+
+def statistics(log_path: str) -> list:
+    """The Hypothesis statistics section of a shard's pytest output."""
+    with open(log_path) as f:
+        lines = f.read().splitlines()
+    start = next((i for i, line in enumerate(lines) if "Hypothesis Statistics" in line), None)
+    if start is None:
+        return []
+    end = next((i for i in range(start + 1, len(lines)) if lines[i].startswith("=")), len(lines))
+    return [line for line in lines[start + 1:end] if line.strip()]
+
+
+def junit_summary(path: str) -> dict:
+    if not os.path.exists(path):
+        return {"tests": 0, "failures": 0, "errors": 1, "time": 0.0}
+    suite = ElementTree.parse(path).getroot()
+    suite = suite if suite.tag == "testsuite" else suite.find("testsuite")
+    return {key: float(suite.get(key, 0)) if key == "time" else int(suite.get(key, 0))
+            for key in ["tests", "failures", "errors", "time"]}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, default=os.cpu_count())
+    parser.add_argument("--examples", type=int, default=40, help="examples across all shards (default: 40)")
+    parser.add_argument("--seed", type=int, default=0, help="shard i runs with Hypothesis seed `seed + i`")
+    parser.add_argument("--cmd", default="ganache-cli", help="dev chain command (default: ganache-cli)")
+    parser.add_argument("--base-port", type=int, default=8600, help="shard i's chain listens on `base-port + i`")
+    parser.add_argument("--output", default=os.path.join(ROOT, "reports", "stateful_shards"))
+    parser.add_argument("--database", default=None,
+                        help="Hypothesis example database to seed from and merge into (default: brownie's)")
+    args = parser.parse_args(argv)
+    database_root = args.database or default_database()
+
+    os.makedirs(args.output, exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix="stateful-shards-")
+    examples = -(-args.examples // args.shards)
+    add_networks(args.shards, args.base_port, args.cmd)
+    processes = []
+    started = time.time()
+    try:
+        for shard in range(args.shards):
+            database = os.path.join(workdir, f"examples-{shard}")
+            seed_database(database_root, database)
+            env = dict(os.environ, YIEDL_STATEFUL_MAX_EXAMPLES=str(examples), YIEDL_HYPOTHESIS_DB=database)
+            log = open(os.path.join(args.output, f"shard-{shard}.log"), "w")
+            process = subprocess.Popen(
+                ["brownie", "test", TEST, "--network", network_id(shard), f"--hypothesis-seed={args.seed + shard}",
+                 "--hypothesis-show-statistics", f"--junitxml={os.path.join(args.output, f'shard-{shard}.xml')}"],
+                cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT
+            )
+            processes.append((shard, process, log, database))
+        for _, process, log, _ in processes:
+            process.wait()
+            log.close()
+    finally:
+        for _, process, _, _ in processes:
+            if process.poll() is None:
+                process.kill()
+        delete_networks(args.shards)
+    elapsed = time.time() - started
+
+    failed = []
+    print(f"{args.shards} shards x {examples} examples in {elapsed:.0f}s")
+    for shard, process, _, _ in processes:
+        summary = junit_summary(os.path.join(args.output, f"shard-{shard}.xml"))
+        passed = process.returncode == 0
+        if not passed:
+            failed.append(shard)
+        print(f"shard {shard} (seed {args.seed + shard}): {'passed' if passed else 'FAILED'}, "
+              f"{summary['tests']} tests, {summary['failures']} failures, {summary['errors']} errors, "
+              f"{summary['time']:.0f}s")
+        for line in statistics(os.path.join(args.output, f"shard-{shard}.log")):
+            print(f"    {line}")
+    added = merge_databases([database for _, _, _, database in processes], database_root)
+    print(f"merged {added} new examples into {database_root}")
+    shutil.rmtree(workdir, ignore_errors=True)
+    if failed:
+        print(f"failed shards: {failed}, logs in {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
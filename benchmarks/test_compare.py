@@ -0,0 +1,44 @@
+import json
+from compare import MISSING, compare, main
+
+
+def report(results: dict) -> dict:
+    return {"commit": None, "results": {name: {str(size): {"gas_used": gas} for size, gas in sizes.items()}
+                                        for name, sizes in results.items()}}
+
+
+def flagged(old: dict, new: dict) -> dict:
+    return {(name, size): regressed for name, size, _, _, _, regressed in compare(report(old), report(new), 0.02)}
+
+
+def test_gas_increase():
+    old = {"completeDeposits": {10: 1000000, 100: 5000000}}
+    new = {"completeDeposits": {10: 1010000, 100: 5200000}}
+    assert flagged(old, new) == {("completeDeposits", 10): False, ("completeDeposits", 100): True}
+
+
+def test_no_longer_fits():
+    old = {"completeDeposits": {500: 20000000, 1000: None}}
+    new = {"completeDeposits": {500: None, 1000: None}}
+    assert flagged(old, new) == {("completeDeposits", 500): True, ("completeDeposits", 1000): False}
+    # fitting where it used to run out of gas is not a regression.
+    assert flagged(new, old)[("completeDeposits", 500)] is False
+
+
+def test_missing_entries():
+    old = {"completeDeposits": {10: 1000000, 100: 5000000}, "processWithdrawals": {10: 900000}}
+    new = {"completeDeposits": {10: 1000000, 1000: 40000000}}
+    rows = compare(report(old), report(new), 0.02)
+    assert ("completeDeposits", 100, 5000000, MISSING, None, True) in rows
+    assert ("processWithdrawals", 10, 900000, MISSING, None, True) in rows
+    assert ("completeDeposits", 1000, MISSING, 40000000, None, False) in rows
+
+
+def test_exit_status(tmp_path):
+    paths = []
+    for name, results in [("old", {"completeDeposits": {10: 1000000}}), ("new", {"completeDeposits": {10: None}})]:
+        paths.append(str(tmp_path / f"{name}.json"))
+        with open(paths[-1], "w") as f:
+            json.dump(report(results), f)
+    assert main(paths) == 1
+    assert main([paths[0], paths[0]]) == 0
@@ -0,0 +1,168 @@
+"""
+Gas benchmarks for the Vault batch settlement entry points.
+
+    brownie test benchmarks/ -s
+
+Each cohort size starts from the fresh `BaseTest.setup_default_blacklist` deployment, the pending tokens are
+filled with that many holders and `completeDeposits`, `processWithdrawals` and `completeWithdrawals` are each run as a
+single batch. The per-request cost of `Router.depositRequest` and `withdrawRequest` is recorded while filling the
+pending tokens. Batches that do not fit in a block are recorded with `gas_used = None`; raise the development chain limit
+to measure them, e.g. `brownie networks modify development gas_limit=1000000000`.
+
+Results are written to `reports/gas_benchmark.json` (override with the GAS_BENCHMARK_OUTPUT environment variable) and
+can be compared across commits with `python benchmarks/compare.py old.json new.json`.
+"""
+import hashlib
+import json
+import os
+import subprocess
+import pytest
+from brownie import web3
+from brownie.convert import to_address
+from base import *
+
+COHORT_SIZES = [10, 100, 500, 1000]
+BATCH_FUNCTIONS = ["completeDeposits", "processWithdrawals", "completeWithdrawals"]
+REQUEST_FUNCTIONS = ["depositRequest", "withdrawRequest"]
+DEFAULT_OUTPUT = os.path.join("reports", "gas_benchmark.json")
+
+results = {name: {} for name in REQUEST_FUNCTIONS + BATCH_FUNCTIONS}
+
+
+def cohort(size: int) -> list:
+    # Deterministic, non-account receivers so that runs are comparable across commits.
+    return [to_address("0x" + hashlib.sha256(f"yiedl-bench-{i}".encode()).hexdigest()[:40]) for i in range(size)]
+
+
+def does_not_fit(error: Exception) -> bool:
+    # Only running out of gas or over the block gas limit means the batch is too large; anything else is a bug.
+    if getattr(error, "revert_type", None) == "out of gas":
+        return True
+    message = str(error).lower()
+    return "out of gas" in message or "gas limit" in message
+
+
+def current_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def linear_fit(points: [tuple]):
+    # Least squares fit of gas = fixed + per_user * users.
+    n = len(points)
+    if n < 2:
+        return None, None
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0:
+        return None, None
+    per_user = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+    return mean_y - per_user * mean_x, per_user
+
+
+def summarize(block_gas_limit: int) -> dict:
+    summary = {}
+    for name, by_size in results.items():
+        measured = sorted((size, entry["gas_used"]) for size, entry in by_size.items()
+                          if entry["gas_used"] is not None)
+        previous = None
+        for size, gas_used in measured:
+            entry = by_size[size]
+            entry["gas_per_user"] = gas_used // size
+            entry["marginal_gas_per_user"] = None if previous is None else \
+                (gas_used - previous[1]) // (size - previous[0])
+            previous = (size, gas_used)
+
+        fixed, per_user = linear_fit(measured)
+        summary[name] = {
+            "fixed_gas": None if fixed is None else int(fixed),
+            "marginal_gas_per_user": None if per_user is None else int(per_user),
+            "max_users_per_block": None if per_user is None or per_user <= 0
+            else int((block_gas_limit - fixed) // per_user),
+        }
+    return summary
+
+
+@pytest.fixture(scope="module", autouse=True)
+def write_results():
+    yield
+    block_gas_limit = web3.eth.get_block("latest")["gasLimit"]
+    output = os.environ.get("GAS_BENCHMARK_OUTPUT", DEFAULT_OUTPUT)
+    report = {
+        "commit": current_commit(),
+        "block_gas_limit": block_gas_limit,
+        "cohort_sizes": COHORT_SIZES,
+        "summary": summarize(block_gas_limit),
+        "results": {name: {str(size): entry for size, entry in sorted(by_size.items())}
+                    for name, by_size in results.items()},
+    }
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\nGas benchmark written to {output}")
+    print(json.dumps(report["summary"], indent=2, sort_keys=True))
+
+
+class TestGasBenchmark(BaseTest):
+    amount = 100 * 1000000
+    nav = 1000000
+
+    def after_setup_hook(self):
+        self.block_gas_limit = web3.eth.get_block("latest")["gasLimit"]
+        self.usdc.approve(self.router, self.max_uint, fr(self.client1))
+        self.vault.approve(self.router, self.max_uint, fr(self.client1))
+        self.usdc.transfer(self.client1, int(1e12), fr(self.usdc_source))
+
+    def measure(self, name: str, size: int, fn, *args):
+        try:
+            tx = fn(*args, {"from": self.admin, "gas_limit": self.block_gas_limit})
+            gas_used, error = tx.gas_used, None
+        except Exception as e:
+            if not does_not_fit(e):
+                raise
+            gas_used, error = None, type(e).__name__
+        results[name][size] = {"users": size, "gas_used": gas_used, "error": error}
+        print(f"{name} x{size}: {gas_used}")
+        return gas_used is not None
+
+    @pytest.mark.parametrize("size", COHORT_SIZES)
+    def test_batch_gas(self, size):
+        users = cohort(size)
+
+        # Fill pd-USDC with `size` holders.
+        gas_used = 0
+        for user in users:
+            gas_used += self.router.depositRequest(self.vault, self.amount, user, fr(self.client1)).gas_used
+        results["depositRequest"][size] = {"users": size, "gas_used": gas_used, "error": None}
+        verify(size, self.deposit_request_mgr.numberOfShareHolders())
+        completed = self.measure("completeDeposits", size, self.vault.completeDeposits,
+                                 self.nav, [[user, self.amount] for user in users])
+        if completed:
+            verify(0, self.deposit_request_mgr.numberOfShareHolders())
+
+        # Fill pw-yLONG with `size` holders from a single share holder.
+        self.vault.manualMint(self.amount * size, self.client1, fr(self.admin))
+        gas_used = 0
+        for user in users:
+            gas_used += self.router.withdrawRequest(self.vault, self.amount, user, fr(self.client1)).gas_used
+        results["withdrawRequest"][size] = {"users": size, "gas_used": gas_used, "error": None}
+        verify(size, self.withdraw_request_mgr.numberOfShareHolders())
+        processed = self.measure("processWithdrawals", size, self.vault.processWithdrawals,
+                                 self.nav, [[user, self.amount] for user in users])
+        if not processed:
+            results["completeWithdrawals"][size] = {"users": size, "gas_used": None, "error": "skipped"}
+            return
+        verify(size, self.withdraw_processor.numberOfShareHolders())
+
+        # Make sure the vault can pay out every pw-USDC holder.
+        pw_amount = self.amount * self.nav // self.single_unit
+        shortfall = pw_amount * size - self.usdc.balanceOf(self.vault)
+        if shortfall > 0:
+            self.usdc.transfer(self.vault, shortfall, fr(self.usdc_source))
+        if self.measure("completeWithdrawals", size, self.vault.completeWithdrawals,
+                        [[user, pw_amount] for user in users]):
+            verify(0, self.withdraw_processor.numberOfShareHolders())
@@ -0,0 +1,51 @@
+import unittest
+import pytest
+from hypothesis import Phase, given, settings, strategies as st
+from hypothesis.database import DirectoryBasedExampleDatabase
+from run_stateful_sharded import merge_databases, seed_database
+
+replayed = []
+
+
+def run(database: str, reuse_only: bool = False):
+    """Run a property against `database`; with `reuse_only` it only replays saved examples and generates nothing."""
+    phases = [Phase.reuse] if reuse_only else [Phase.reuse, Phase.generate, Phase.shrink]
+    replayed.clear()
+
+    # Every run builds the same function, so every run shares one database key, as the stateful test does.
+    @settings(database=DirectoryBasedExampleDatabase(database), phases=phases, max_examples=200, deadline=None)
+    @given(st.integers(min_value=0, max_value=1000))
+    def bounded(x):
+        replayed.append(x)
+        assert x < 500
+
+    bounded()
+
+
+def test_shard_replays_saved_failure(tmp_path):
+    main_database, shard_database = str(tmp_path / "hypothesis"), str(tmp_path / "shard-0")
+    with pytest.raises(AssertionError):
+        run(main_database)
+
+    # a shard seeded from the main database replays the saved failure without generating anything.
+    seed_database(main_database, shard_database)
+    with pytest.raises(AssertionError):
+        run(shard_database, reuse_only=True)
+    assert replayed and replayed[0] >= 500
+
+    # an empty database has nothing to replay.
+    with pytest.raises(unittest.SkipTest):
+        run(str(tmp_path / "empty"), reuse_only=True)
+    assert replayed == []
+
+
+def test_merged_failure_is_replayed(tmp_path):
+    main_database, shard_database = str(tmp_path / "hypothesis"), str(tmp_path / "shard-0")
+    seed_database(main_database, shard_database)
+    with pytest.raises(AssertionError):
+        run(shard_database)
+
+    assert merge_databases([shard_database], main_database) > 0
+    assert merge_databases([shard_database], main_database) == 0
+    with pytest.raises(AssertionError):
+        run(main_database, reuse_only=True)
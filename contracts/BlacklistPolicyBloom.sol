@@ -0,0 +1,145 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.15;
+
+import "../interfaces/IBlacklistPolicy.sol";
+import "./AccessControlRci.sol";
+
+contract BlacklistPolicyBloom is IBlacklistPolicy, AccessControlRci {
+
+    /*
+    @dev: Blacklist stored as a blocked Bloom filter: every address hashes to one 256-bit word of the filter and to
+    @dev: three bits inside that word, so a lookup is a single SLOAD and most clean addresses fail on the first word.
+    @dev: Large lists are loaded by OR-ing precomputed word masks (see `yiedl/bloom.py`), one SSTORE per word instead
+    @dev: of one per address. Entries cannot be removed from the filter; `updateClearance` overrides false positives
+    @dev: and delisted addresses, and `resetBlacklist` starts an empty filter by bumping the generation.
+    */
+
+    uint256 public immutable filterWords;
+    uint256 public generation;
+
+    mapping(uint256 => uint256) private filter;
+    mapping(uint256 => mapping(address => bool)) private cleared;
+
+    event BlacklistReset(uint256 indexed generation);
+    event ClearanceUpdated(uint256 indexed generation, address indexed account, bool cleared);
+
+    constructor(uint8 filterWordBits) {
+        require(filterWordBits <= 24, "Filter too large.");
+        _initializeRciAdmin(msg.sender);
+        filterWords = 1 << filterWordBits;
+    }
+
+    function addToBlacklist(address[] calldata accounts)
+    external onlyRole(RCI_CHILD_ADMIN)
+    returns (bool)
+    {
+        uint256 currentGeneration = generation;
+        for (uint i = 0; i < accounts.length; i++) {
+            (uint256 key, uint256 mask) = _locate(currentGeneration, accounts[i]);
+            filter[key] |= mask;
+        }
+        return true;
+    }
+
+    function mergeFilterWords(uint256[] calldata wordIndexes, uint256[] calldata masks)
+    external onlyRole(RCI_CHILD_ADMIN)
+    returns (bool)
+    {
+        require(wordIndexes.length == masks.length, "Length mismatch.");
+        uint256 base = generation << 32;
+        for (uint i = 0; i < wordIndexes.length; i++) {
+            require(wordIndexes[i] < filterWords, "Invalid word.");
+            filter[base | wordIndexes[i]] |= masks[i];
+        }
+        return true;
+    }
+
+    function updateClearance(address account, bool toClear)
+    external onlyRole(RCI_CHILD_ADMIN)
+    returns (bool)
+    {
+        cleared[generation][account] = toClear;
+        emit ClearanceUpdated(generation, account, toClear);
+        return true;
+    }
+
+    function resetBlacklist()
+    external onlyRole(RCI_CHILD_ADMIN)
+    returns (bool)
+    {
+        generation += 1;
+        emit BlacklistReset(generation);
+        return true;
+    }
+
+    function filterWord(uint256 wordIndex)
+    external view
+    returns (uint256)
+    {
+        return filter[(generation << 32) | wordIndex];
+    }
+
+    function isBlacklisted(address account)
+    public view
+    returns (bool)
+    {
+        if (account == address(0)) {
+            return false;
+        }
+        uint256 currentGeneration = generation;
+        (uint256 key, uint256 mask) = _locate(currentGeneration, account);
+        if (filter[key] & mask != mask) {
+            return false;
+        }
+        return !cleared[currentGeneration][account];
+    }
+
+    function _locate(uint256 currentGeneration, address account)
+    internal view
+    returns (uint256 key, uint256 mask)
+    {
+        uint256 h = uint256(keccak256(abi.encodePacked(currentGeneration, account)));
+        key = (currentGeneration << 32) | (h & (filterWords - 1));
+        mask = (1 << ((h >> 232) & 255)) | (1 << ((h >> 240) & 255)) | (1 << ((h >> 248) & 255));
+    }
+
+    function _policy(address from, address to)
+    internal view
+    returns (bool)
+    {
+        return !(isBlacklisted(to) || isBlacklisted(from));
+    }
+
+    function transferPolicy(address from, address to, uint256 amount)
+    external view override
+    returns (bool)
+    {
+        return _policy(from, to);
+    }
+
+    function depositPolicy(uint256 assets, uint256 shares, address receiver, address sender)
+    external view override
+    returns (bool)
+    {
+        return _policy(receiver, sender);
+    }
+
+    function withdrawPolicy(uint256 assets, uint256 shares, address receiver, address sender)
+    external view override
+    returns (bool)
+    {
+        return _policy(receiver, sender);
+    }
+
+    function batchPolicy(address[] calldata users)
+    external view override
+    returns (uint256[] memory blocked)
+    {
+        blocked = new uint256[]((users.length + 255) / 256);
+        for (uint i = 0; i < users.length; i++) {
+            if (isBlacklisted(users[i])) {
+                blocked[i >> 8] |= 1 << (i & 255);
+            }
+        }
+    }
+}
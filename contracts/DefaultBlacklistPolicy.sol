@@ -27,4 +27,11 @@ contract DefaultBlacklistPolicy is IBlacklistPolicy {
     {
         return true;
     }
+
+    function batchPolicy(address[] calldata users)
+    external view override
+    returns (uint256[] memory blocked)
+    {
+        blocked = new uint256[]((users.length + 255) / 256);
+    }
 }
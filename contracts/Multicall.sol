@@ -0,0 +1,32 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.15;
+
+contract Multicall {
+
+    /*
+    @dev: Read aggregator for off-chain clients: runs every call as a STATICCALL and returns the raw results with the
+    @dev: block number they were read at, so a whole vault snapshot costs one eth_call. Failed calls do not revert the
+    @dev: batch; their `success` flag is false.
+    */
+
+    struct Call {
+        address target;
+        bytes callData;
+    }
+
+    struct Result {
+        bool success;
+        bytes returnData;
+    }
+
+    function aggregate(Call[] calldata calls)
+    external view
+    returns (uint256 blockNumber, Result[] memory results)
+    {
+        blockNumber = block.number;
+        results = new Result[](calls.length);
+        for (uint i = 0; i < calls.length; i++) {
+            (results[i].success, results[i].returnData) = calls[i].target.staticcall(calls[i].callData);
+        }
+    }
+}
@@ -11,7 +11,7 @@ abstract contract PendingToken is ERC20, AccessControlRci, Initializable {
     using EnumerableSet for EnumerableSet.AddressSet;
     using Address for address;
 
-    EnumerableSet.AddressSet private shareHolders;
+    EnumerableSet.AddressSet internal shareHolders;
     bool private recursionFlag;
     string private _name;
     string private _symbol;
@@ -56,6 +56,26 @@ abstract contract PendingToken is ERC20, AccessControlRci, Initializable {
         return 6;
     }
 
+    /*
+    @dev: Returns up to `maxCount` holders from `startIndex` along with their balances, and the index to continue from.
+    @dev: Pages past the end are truncated instead of reverting; `nextIndex == numberOfShareHolders()` when done.
+    */
+    function getShareHoldersWithBalances(uint256 startIndex, uint256 maxCount)
+    external view
+    returns (address[] memory holders, uint256[] memory balances, uint256 nextIndex)
+    {
+        uint256 holdersCount = shareHolders.length();
+        if (startIndex > holdersCount) {
+            startIndex = holdersCount;
+        }
+        nextIndex = maxCount < holdersCount - startIndex ? startIndex + maxCount : holdersCount;
+        holders = getListFromSet(shareHolders, startIndex, nextIndex);
+        balances = new uint256[](holders.length);
+        for (uint i = 0; i < holders.length; i++) {
+            balances[i] = balanceOf(holders[i]);
+        }
+    }
+
     function numberOfShareHolders()
     public view
     returns (uint256 holdersCount)
@@ -77,10 +97,19 @@ abstract contract PendingToken is ERC20, AccessControlRci, Initializable {
     }
 
     function _afterTokenTransfer(address from, address to, uint256 amount)
-    internal override
+    internal virtual override
     {
-        updateShareHolders(from);
-        updateShareHolders(to);
+        // Only a non-zero movement can change membership: `from` may drop out and `to` may join.
+        // address(0) is the mint source / burn sink and is never tracked.
+        if (amount == 0) {
+            return;
+        }
+        if (from != address(0) && balanceOf(from) == 0) {
+            shareHolders.remove(from);
+        }
+        if (to != address(0)) {
+            shareHolders.add(to);
+        }
     }
 
     function burnFrom(address account, uint256 amount)
@@ -89,16 +118,6 @@ abstract contract PendingToken is ERC20, AccessControlRci, Initializable {
         _burn(account, amount);
     }
 
-    function updateShareHolders(address userAddress)
-    internal
-    {
-        if (balanceOf(userAddress) > 0) {
-            shareHolders.add(userAddress);
-        } else {
-            shareHolders.remove(userAddress);
-        }
-    }
-
     function getListFromSet(EnumerableSet.AddressSet storage setOfData, uint256 startIndex, uint256 endIndex)
     internal view
     returns (address[] memory listOfData)
@@ -5,6 +5,7 @@ import "./RequestManager.sol";
 import "OpenZeppelin/openzeppelin-contracts@4.8.0/contracts/proxy/Clones.sol";
 import "./Types.sol";
 import "./Router.sol";
+import "./VaultMath.sol";
 
 contract Processor is PendingToken, Types {
 
@@ -39,16 +40,33 @@ contract Processor is PendingToken, Types {
         _setRoleAdmin(RCI_VAULT, RCI_MAIN_ADMIN);
     }
 
-    function processSingleWithdrawal(uint256 pSharesIn, address receiver, uint256 nav, uint256 singleUnit)
+    function processSingleWithdrawal(uint256 pSharesIn, address receiver, uint256 nav)
     external onlyRole(RCI_VAULT)
     returns (uint256 pwUsdcOut)
     {
         require(pSharesIn > 0, "nothing to deposit");
         withdrawRequestManager.redeem(pSharesIn, address(this), receiver);
-        pwUsdcOut = pSharesIn * nav / singleUnit;
+        pwUsdcOut = VaultMath.sharesToUsdc(pSharesIn, nav);
         shareMint(receiver, pwUsdcOut);
     }
 
+    /*
+    @dev: Batch version of `processSingleWithdrawal`: redeems the pending shares of the whole cohort in one call and
+    @dev: mints pw-USDC to every receiver.
+    */
+    function processWithdrawalBatch(UsersAndAmounts[] calldata usersAndAmountsShares, uint256 nav)
+    external onlyRole(RCI_VAULT)
+    returns (uint256[] memory pwUsdcOut)
+    {
+        withdrawRequestManager.redeemBatch(usersAndAmountsShares, address(this));
+        pwUsdcOut = new uint256[](usersAndAmountsShares.length);
+        for (uint i = 0; i < usersAndAmountsShares.length; i++) {
+            require(usersAndAmountsShares[i].amount > 0, "nothing to deposit");
+            pwUsdcOut[i] = VaultMath.sharesToUsdc(usersAndAmountsShares[i].amount, nav);
+            shareMint(usersAndAmountsShares[i].user, pwUsdcOut[i]);
+        }
+    }
+
     function reclaimPwUsdc(uint256 pwUsdc, address user)
     external onlyRole(RCI_VAULT)
     {
@@ -56,4 +74,13 @@ contract Processor is PendingToken, Types {
         burnFrom(user, pwUsdc); // 1:1 pw-USDC to USDC ratio
     }
 
-}
\ No newline at end of file
+    function reclaimPwUsdcBatch(UsersAndAmounts[] calldata usersAndAmountsPwUsdc)
+    external onlyRole(RCI_VAULT)
+    {
+        for (uint i = 0; i < usersAndAmountsPwUsdc.length; i++) {
+            require(usersAndAmountsPwUsdc[i].amount > 0);
+            burnFrom(usersAndAmountsPwUsdc[i].user, usersAndAmountsPwUsdc[i].amount);
+        }
+    }
+
+}
@@ -5,8 +5,9 @@ import "./PendingToken.sol";
 import "OpenZeppelin/openzeppelin-contracts@4.8.0/contracts/security/ReentrancyGuard.sol";
 import "OpenZeppelin/openzeppelin-contracts@4.8.0/contracts/interfaces/IERC4626.sol";
 import "../interfaces/IRequestManagerAdmin.sol";
+import "./Types.sol";
 
-contract RequestManager is ReentrancyGuard, PendingToken, IERC4626, IRequestManagerAdmin {
+contract RequestManager is ReentrancyGuard, PendingToken, IERC4626, IRequestManagerAdmin, Types {
     using SafeERC20 for IERC20Metadata;
 
     // specified addresses
@@ -157,15 +158,7 @@ contract RequestManager is ReentrancyGuard, PendingToken, IERC4626, IRequestMana
     public nonReentrant onlyRole(RCI_INFLOW_MGR)
     returns (uint256 shares)
     {
-        // Calculate how many shares to mint.
-        shares = previewDeposit(assets);
-
-        // Check limits.
-        require(assets <= maxDeposit(receiver));
-        require(shares <= maxMint(receiver));
-
-        // mint share tokens for subscriber
-        shareMint(receiver, shares);
+        shares = mintForDeposit(assets, receiver);
 
         // perform updates
         totalDeposited += assets;
@@ -175,9 +168,41 @@ contract RequestManager is ReentrancyGuard, PendingToken, IERC4626, IRequestMana
 
         // Move to vault.
         assetToken.transfer(vault, assets);
+    }
 
-        // emit Deposit event
-        emit Deposit(msg.sender, receiver, assets, shares);
+    function depositBatch(uint256[] calldata assets, address[] calldata receivers)
+    public nonReentrant onlyRole(RCI_INFLOW_MGR)
+    returns (uint256 totalAssetsIn)
+    {
+        totalAssetsIn = mintForDepositBatch(assets, receivers);
+
+        // perform updates
+        totalDeposited += totalAssetsIn;
+
+        // Transfer in asset and move it to the vault once for the whole batch.
+        assetToken.safeTransferFrom(msg.sender, address(this), totalAssetsIn);
+        assetToken.transfer(vault, totalAssetsIn);
+    }
+
+    /*
+    @dev: Pending-token accounting only, for inflow managers that have already moved `assets` straight to the vault.
+    @dev: Saves the transfer into and out of this contract that `deposit` performs. Nothing here checks that the vault
+    @dev: received `assets`: RCI_INFLOW_MGR is trusted to have moved them, as the Router checks for every request.
+    */
+    function recordDeposit(uint256 assets, address receiver)
+    public nonReentrant onlyRole(RCI_INFLOW_MGR)
+    returns (uint256 shares)
+    {
+        shares = mintForDeposit(assets, receiver);
+        totalDeposited += assets;
+    }
+
+    function recordDepositBatch(uint256[] calldata assets, address[] calldata receivers)
+    public nonReentrant onlyRole(RCI_INFLOW_MGR)
+    returns (uint256 totalAssetsIn)
+    {
+        totalAssetsIn = mintForDepositBatch(assets, receivers);
+        totalDeposited += totalAssetsIn;
     }
 
     function mint(uint256 shares, address receiver)
@@ -252,6 +277,59 @@ contract RequestManager is ReentrancyGuard, PendingToken, IERC4626, IRequestMana
         emit Withdraw(msg.sender, receiver, owner, assets, shares);
     }
 
+    function redeemBatch(UsersAndAmounts[] calldata ownersAndShares, address receiver)
+    public nonReentrant onlyRole(RCI_OUTFLOW_MGR)
+    returns (uint256 totalAssetsOut)
+    {
+        for (uint i = 0; i < ownersAndShares.length; i++) {
+            address owner = ownersAndShares[i].user;
+            uint256 shares = ownersAndShares[i].amount;
+            uint256 assets = previewRedeem(shares);
+
+            require(shares <= maxRedeem(owner));
+            require(assets <= maxWithdraw(owner));
+
+            burnFrom(owner, shares);
+            totalAssetsOut += assets;
+
+            emit Withdraw(msg.sender, receiver, owner, assets, shares);
+        }
+
+        // perform updates
+        totalDeposited -= totalAssetsOut;
+
+        // Return assets once for the whole batch.
+        assetToken.safeTransfer(receiver, totalAssetsOut);
+    }
+
+    function mintForDeposit(uint256 assets, address receiver)
+    internal
+    returns (uint256 shares)
+    {
+        // Calculate how many shares to mint.
+        shares = previewDeposit(assets);
+
+        // Check limits.
+        require(assets <= maxDeposit(receiver));
+        require(shares <= maxMint(receiver));
+
+        // mint share tokens for subscriber
+        shareMint(receiver, shares);
+
+        emit Deposit(msg.sender, receiver, assets, shares);
+    }
+
+    function mintForDepositBatch(uint256[] calldata assets, address[] calldata receivers)
+    internal
+    returns (uint256 totalAssetsIn)
+    {
+        require(assets.length == receivers.length, "Length mismatch.");
+        for (uint i = 0; i < assets.length; i++) {
+            mintForDeposit(assets[i], receivers[i]);
+            totalAssetsIn += assets[i];
+        }
+    }
+
     function totalAssets()
     public view override
     returns(uint256 totalManagedAssets)
@@ -7,13 +7,15 @@ import "./Vault.sol";
 import "OpenZeppelin/openzeppelin-contracts@4.8.0/contracts/utils/structs/EnumerableSet.sol";
 import "OpenZeppelin/openzeppelin-contracts@4.8.0/contracts/security/ReentrancyGuard.sol";
 import "OpenZeppelin/openzeppelin-contracts@4.8.0/contracts/token/ERC20/utils/SafeERC20.sol";
+import "OpenZeppelin/openzeppelin-contracts@4.8.0/contracts/utils/math/SafeCast.sol";
 
-contract Router is ReentrancyGuard, AccessControlRci
+contract Router is ReentrancyGuard, AccessControlRci, Types
 {
     using EnumerableSet for EnumerableSet.AddressSet;
     using EnumerableSet for EnumerableSet.UintSet;
     using SafeERC20 for IERC20Metadata;
     using Address for address;
+    using SafeCast for uint256;
 
     enum RequestType { Deposit, Withdraw, RefundDeposit, RefundWithdraw, ManualMint }
     struct RequestRecord {
@@ -35,18 +37,52 @@ contract Router is ReentrancyGuard, AccessControlRci
         uint256 feesPaid;
     }
 
+    // Storage layouts of the records above: 4 slots each instead of 6 and 7.
+    struct StoredRequestRecord {
+        address vault;
+        RequestType requestType;
+        address sender;
+        address receiver;
+        uint40 timestamp;
+        uint128 amount;
+    }
+
+    struct StoredProcessedRecord {
+        address vault;
+        RequestType requestType;
+        address receiver;
+        uint40 timestamp;
+        uint128 amountIn;
+        uint128 amountOut;
+        uint128 feesPaid;
+    }
+
     EnumerableSet.AddressSet private authorizedVaults;
 
-    mapping (address => RequestRecord[]) public requestRecords;
-    mapping (address => ProcessedRecord[]) public processedRecords;
+    /*
+    @dev: A self-request (sender == receiver) is stored directly in the user's history, as a single 4-slot record.
+    @dev: A third-party request is stored once in `requestLog`, and both histories get a one-slot pointer entry
+    @dev: (`vault == address(0)`, `amount` = log index) instead of two full records.
+    */
+    mapping (address => StoredRequestRecord[]) private requestHistory;
+    StoredRequestRecord[] private requestLog;
+    mapping (address => StoredProcessedRecord[]) public processedRecords;
     IBlacklistPolicy public blacklistPolicy;
+    // When false, history is only emitted as RequestRecorded/ProcessedRecorded events and not kept in storage.
+    bool public recordsInStorage;
 
     event BlacklistPolicyUpdated(address indexed oldAddress, address indexed newAddress);
+    event RecordStorageUpdated(bool indexed inStorage);
+    event RequestRecorded(address indexed vault, address indexed sender, address indexed receiver,
+        RequestType requestType, uint256 timestamp, uint256 amount);
+    event ProcessedRecorded(address indexed user, address indexed vault, RequestType requestType,
+        address receiver, uint256 timestamp, uint256 amountIn, uint256 amountOut, uint256 feesPaid);
 
     constructor(address blacklistPolicy_)
     {
         _initializeRciAdmin(msg.sender);
         blacklistPolicy = IBlacklistPolicy(blacklistPolicy_);
+        recordsInStorage = true;
     }
 
         function depositRequest(address vault, uint256 amountUsdc, address receiver)
@@ -55,11 +91,13 @@ contract Router is ReentrancyGuard, AccessControlRci
         require(authorizedVaults.contains(vault));
         require(blacklistPolicy.depositPolicy(amountUsdc, 0, receiver, msg.sender), "Failed blacklist check.");
 
-        // Transfer in asset.
+        // Transfer in asset straight to the vault; the request manager only does the pending-token accounting.
         IERC20Metadata usdcToken = IERC20Metadata(Vault(vault).usdcToken());
-        usdcToken.safeTransferFrom(msg.sender, address(this), amountUsdc);
+        uint256 vaultUsdc = usdcToken.balanceOf(vault);
+        usdcToken.safeTransferFrom(msg.sender, vault, amountUsdc);
+        require(usdcToken.balanceOf(vault) - vaultUsdc == amountUsdc, "Deposit not received.");
 
-        Vault(vault).pendingDepositUsdc().deposit(amountUsdc, receiver);
+        Vault(vault).pendingDepositUsdc().recordDeposit(amountUsdc, receiver);
         RequestRecord memory record = RequestRecord({
             vault: vault,
             requestType: RequestType.Deposit,
@@ -68,10 +106,7 @@ contract Router is ReentrancyGuard, AccessControlRci
             timestamp: block.timestamp,
             amount: amountUsdc
         });
-        _updateRequestRecord(msg.sender, record);
-        if (msg.sender != receiver) {
-            _updateRequestRecord(receiver, record);
-        }
+        _recordRequest(record);
     }
 
     function withdrawRequest(address vault, uint256 amountShares, address receiver)
@@ -93,10 +128,48 @@ contract Router is ReentrancyGuard, AccessControlRci
             timestamp: block.timestamp,
             amount: amountShares
         });
-        _updateRequestRecord(msg.sender, record);
-        if (msg.sender != receiver) {
-            _updateRequestRecord(receiver, record);
+        _recordRequest(record);
+    }
+
+    function bulkDepositRequest(address vault, uint256[] calldata amountsUsdc, address[] calldata receivers)
+    external nonReentrant
+    {
+        require(authorizedVaults.contains(vault));
+        require(amountsUsdc.length == receivers.length, "Length mismatch.");
+        uint256 totalUsdc = 0;
+        for (uint i = 0; i < receivers.length; i++) {
+            require(blacklistPolicy.depositPolicy(amountsUsdc[i], 0, receivers[i], msg.sender),
+                "Failed blacklist check.");
+            totalUsdc += amountsUsdc[i];
         }
+
+        // Transfer in asset for the whole batch straight to the vault.
+        IERC20Metadata usdcToken = IERC20Metadata(Vault(vault).usdcToken());
+        uint256 vaultUsdc = usdcToken.balanceOf(vault);
+        usdcToken.safeTransferFrom(msg.sender, vault, totalUsdc);
+        require(usdcToken.balanceOf(vault) - vaultUsdc == totalUsdc, "Deposit not received.");
+
+        Vault(vault).pendingDepositUsdc().recordDepositBatch(amountsUsdc, receivers);
+        _recordRequests(vault, RequestType.Deposit, amountsUsdc, receivers);
+    }
+
+    function bulkWithdrawRequest(address vault, uint256[] calldata amountsShares, address[] calldata receivers)
+    external nonReentrant
+    {
+        require(authorizedVaults.contains(vault));
+        require(amountsShares.length == receivers.length, "Length mismatch.");
+        uint256 totalShares = 0;
+        for (uint i = 0; i < receivers.length; i++) {
+            require(blacklistPolicy.withdrawPolicy(0, amountsShares[i], receivers[i], msg.sender));
+            totalShares += amountsShares[i];
+        }
+
+        // Transfer in shares for the whole batch.
+        IERC20Metadata shareToken = IERC20Metadata(vault);
+        shareToken.safeTransferFrom(msg.sender, address(this), totalShares);
+
+        Vault(vault).pendingWithdrawShare().depositBatch(amountsShares, receivers);
+        _recordRequests(vault, RequestType.Withdraw, amountsShares, receivers);
     }
 
     function authorizeVault(address vault)
@@ -104,9 +177,8 @@ contract Router is ReentrancyGuard, AccessControlRci
     {
         require(vault.isContract(), "vault must be a contract.");
         authorizedVaults.add(vault);
-        IERC20Metadata usdcToken = IERC20Metadata(Vault(vault).usdcToken());
+        // Deposits move USDC straight from the sender to the vault, so only withdrawals need an allowance.
         IERC20Metadata shareToken = IERC20Metadata(vault);
-        usdcToken.safeApprove(address(Vault(vault).pendingDepositUsdc()), type(uint256).max);
         shareToken.safeApprove(address(Vault(vault).pendingWithdrawShare()), type(uint256).max);
     }
 
@@ -115,9 +187,7 @@ contract Router is ReentrancyGuard, AccessControlRci
     {
         require(authorizedVaults.contains(vault), "vault not authorized.");
         authorizedVaults.remove(vault);
-        IERC20Metadata usdcToken = IERC20Metadata(Vault(vault).usdcToken());
         IERC20Metadata shareToken = IERC20Metadata(vault);
-        usdcToken.safeApprove(address(Vault(vault).pendingDepositUsdc()), 0);
         shareToken.safeApprove(address(Vault(vault).pendingWithdrawShare()), 0);
     }
 
@@ -137,7 +207,29 @@ contract Router is ReentrancyGuard, AccessControlRci
             amountOut: amountOut,
             feesPaid: feesPaid
         });
-        processedRecords[user].push(record);
+        _updateProcessedRecord(user, record);
+    }
+
+    function updateExchangeRecords(uint8 requestType, ExchangeRecord[] calldata records)
+    external
+    {
+        require(authorizedVaults.contains(msg.sender), "Vault not authorized.");
+        ProcessedRecord memory record = ProcessedRecord({
+            vault: msg.sender,
+            requestType: RequestType(requestType),
+            receiver: address(0),
+            timestamp: block.timestamp,
+            amountIn: 0,
+            amountOut: 0,
+            feesPaid: 0
+        });
+        for (uint i = 0; i < records.length; i++) {
+            record.receiver = records[i].user;
+            record.amountIn = records[i].amountIn;
+            record.amountOut = records[i].amountOut;
+            record.feesPaid = records[i].feesPaid;
+            _updateProcessedRecord(records[i].user, record);
+        }
     }
 
     function numberOfAuthorizedVaults()
@@ -158,7 +250,14 @@ contract Router is ReentrancyGuard, AccessControlRci
     external view
     returns (uint256, uint256)
     {
-        return (requestRecords[user].length, processedRecords[user].length);
+        return (requestHistory[user].length, processedRecords[user].length);
+    }
+
+    function requestRecords(address user, uint256 index)
+    external view
+    returns (RequestRecord memory record)
+    {
+        record = _requestRecordAt(user, index);
     }
 
     function getRecords(
@@ -170,12 +269,12 @@ contract Router is ReentrancyGuard, AccessControlRci
     {
         requests = new RequestRecord[](requestEndIndex - requestStartIndex);
         for (uint i = requestStartIndex; i < requestEndIndex; i++){
-            requests[i - requestStartIndex] = requestRecords[user][i];
+            requests[i - requestStartIndex] = _requestRecordAt(user, i);
         }
 
         processed = new ProcessedRecord[](processedEndIndex - processedStartIndex);
         for (uint i = processedStartIndex; i < processedEndIndex; i++){
-            processed[i - processedStartIndex] = processedRecords[user][i];
+            processed[i - processedStartIndex] = _unpackProcessedRecord(processedRecords[user][i]);
         }
     }
 
@@ -189,9 +288,115 @@ contract Router is ReentrancyGuard, AccessControlRci
         success = true;
     }
 
-    function _updateRequestRecord(address user, RequestRecord memory record)
+    function updateRecordStorage(bool inStorage)
+    external onlyRole(RCI_CHILD_ADMIN)
+    returns (bool success)
+    {
+        recordsInStorage = inStorage;
+        emit RecordStorageUpdated(inStorage);
+        success = true;
+    }
+
+    function _recordRequest(RequestRecord memory record)
+    internal
+    {
+        emit RequestRecorded(record.vault, record.sender, record.receiver, record.requestType,
+            record.timestamp, record.amount);
+        if (recordsInStorage) {
+            StoredRequestRecord memory stored = StoredRequestRecord({
+                vault: record.vault,
+                requestType: record.requestType,
+                sender: record.sender,
+                receiver: record.receiver,
+                timestamp: record.timestamp.toUint40(),
+                amount: record.amount.toUint128()
+            });
+            if (record.sender == record.receiver) {
+                requestHistory[record.sender].push(stored);
+            } else {
+                uint128 index = requestLog.length.toUint128();
+                requestLog.push(stored);
+                requestHistory[record.sender].push().amount = index;
+                requestHistory[record.receiver].push().amount = index;
+            }
+        }
+    }
+
+    function _recordRequests(
+        address vault, RequestType requestType, uint256[] calldata amounts, address[] calldata receivers
+    )
+    internal
+    {
+        RequestRecord memory record = RequestRecord({
+            vault: vault,
+            requestType: requestType,
+            sender: msg.sender,
+            receiver: address(0),
+            timestamp: block.timestamp,
+            amount: 0
+        });
+        for (uint i = 0; i < receivers.length; i++) {
+            record.receiver = receivers[i];
+            record.amount = amounts[i];
+            _recordRequest(record);
+        }
+    }
+
+    function _updateProcessedRecord(address user, ProcessedRecord memory record)
     internal
     {
-        requestRecords[user].push(record);
+        emit ProcessedRecorded(user, record.vault, record.requestType, record.receiver,
+            record.timestamp, record.amountIn, record.amountOut, record.feesPaid);
+        if (recordsInStorage) {
+            processedRecords[user].push(StoredProcessedRecord({
+                vault: record.vault,
+                requestType: record.requestType,
+                receiver: record.receiver,
+                timestamp: record.timestamp.toUint40(),
+                amountIn: record.amountIn.toUint128(),
+                amountOut: record.amountOut.toUint128(),
+                feesPaid: record.feesPaid.toUint128()
+            }));
+        }
+    }
+
+    function _requestRecordAt(address user, uint256 index)
+    internal view
+    returns (RequestRecord memory record)
+    {
+        StoredRequestRecord storage stored = requestHistory[user][index];
+        if (stored.vault == address(0)) {
+            stored = requestLog[stored.amount];
+        }
+        record = _unpackRequestRecord(stored);
+    }
+
+    function _unpackRequestRecord(StoredRequestRecord memory stored)
+    internal pure
+    returns (RequestRecord memory record)
+    {
+        record = RequestRecord({
+            vault: stored.vault,
+            requestType: stored.requestType,
+            sender: stored.sender,
+            receiver: stored.receiver,
+            timestamp: stored.timestamp,
+            amount: stored.amount
+        });
+    }
+
+    function _unpackProcessedRecord(StoredProcessedRecord memory stored)
+    internal pure
+    returns (ProcessedRecord memory record)
+    {
+        record = ProcessedRecord({
+            vault: stored.vault,
+            requestType: stored.requestType,
+            receiver: stored.receiver,
+            timestamp: stored.timestamp,
+            amountIn: stored.amountIn,
+            amountOut: stored.amountOut,
+            feesPaid: stored.feesPaid
+        });
     }
 }
\ No newline at end of file
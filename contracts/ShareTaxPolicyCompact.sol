@@ -0,0 +1,54 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.15;
+
+import "./ShareTaxPolicyVanilla.sol";
+
+contract ShareTaxPolicyCompact is ShareTaxPolicyVanilla {
+
+    /*
+    @dev: Same taxes as ShareTaxPolicyVanilla, but legs going to the same collector are merged into one and zero-amount
+    @dev: legs are dropped, so the token performs at most one transfer per distinct collector.
+    */
+
+    constructor(address federalTaxCollector_,
+                address stateTaxCollector_,
+                uint256 federalTaxPercentage_,
+                uint256 stateTaxPercentage_,
+                uint256 taxDecimals_
+    )
+    ShareTaxPolicyVanilla(federalTaxCollector_, stateTaxCollector_, federalTaxPercentage_, stateTaxPercentage_,
+        taxDecimals_)
+    {}
+
+    function shareTaxActions(address from, address to, uint256 amount)
+    external view override
+    returns (ShareTaxTransfers[] memory shareTaxTransfers)
+    {
+        if (!isTaxable(from, to)) {
+            return new ShareTaxTransfers[](0);
+        }
+        uint256 federalTax = computeFederalTax(amount);
+        uint256 stateTax = computeStateTax(amount);
+        if (federalTaxCollector == stateTaxCollector) {
+            federalTax += stateTax;
+            stateTax = 0;
+        }
+
+        shareTaxTransfers = new ShareTaxTransfers[]((federalTax > 0 ? 1 : 0) + (stateTax > 0 ? 1 : 0));
+        uint256 leg = 0;
+        if (federalTax > 0) {
+            shareTaxTransfers[leg++] = ShareTaxTransfers({
+                                        payer: from,
+                                        collector: federalTaxCollector,
+                                        amount: federalTax
+            });
+        }
+        if (stateTax > 0) {
+            shareTaxTransfers[leg++] = ShareTaxTransfers({
+                                        payer: from,
+                                        collector: stateTaxCollector,
+                                        amount: stateTax
+            });
+        }
+    }
+}
@@ -54,11 +54,18 @@ contract ShareTaxPolicyVanilla is IShareTaxPolicy, AccessControlRci {
         return true;
     }
 
+    function isTaxable(address from, address to)
+    public view virtual
+    returns (bool)
+    {
+        return !(exempt[from] || exempt[to] || vip[from]);
+    }
+
     function shareTaxActions(address from, address to, uint256 amount)
-    external view override
+    external view virtual override
     returns (ShareTaxTransfers[] memory)
     {
-        if (exempt[from] || exempt[to] || vip[from]) {
+        if (!isTaxable(from, to)) {
             return new ShareTaxTransfers[](0);
         }
         ShareTaxTransfers[] memory shareTaxTransfers = new ShareTaxTransfers[](2);
@@ -19,6 +19,26 @@ abstract contract ShareholderEnumerableToken is ERC20 {
         shareHoldersList = getListFromSet(shareHolders, startIndex, endIndex);
     }
 
+    /*
+    @dev: Returns up to `maxCount` holders from `startIndex` along with their balances, and the index to continue from.
+    @dev: Pages past the end are truncated instead of reverting; `nextIndex == numberOfShareHolders()` when done.
+    */
+    function getShareHoldersWithBalances(uint256 startIndex, uint256 maxCount)
+    external view
+    returns (address[] memory holders, uint256[] memory balances, uint256 nextIndex)
+    {
+        uint256 holdersCount = shareHolders.length();
+        if (startIndex > holdersCount) {
+            startIndex = holdersCount;
+        }
+        nextIndex = maxCount < holdersCount - startIndex ? startIndex + maxCount : holdersCount;
+        holders = getListFromSet(shareHolders, startIndex, nextIndex);
+        balances = new uint256[](holders.length);
+        for (uint i = 0; i < holders.length; i++) {
+            balances[i] = balanceOf(holders[i]);
+        }
+    }
+
     function numberOfShareHolders()
     public view
     returns (uint256 holdersCount)
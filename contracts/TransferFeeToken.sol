@@ -13,9 +13,15 @@ abstract contract TransferFeeToken is AccessControlRci, ShareholderEnumerableTok
     IBlacklistPolicy public blacklistPolicy;
     IShareTaxPolicy public shareTaxPolicy;
         bool private recursionFlag;
+    // Set by the Vault while it mints to a settlement cohort already cleared with `IBlacklistPolicy.batchPolicy`.
+    bool private cohortMintsCleared;
+    // Addresses the share tax policy never taxes, e.g. the router and withdraw manager; transfers from or to them skip
+    // the `shareTaxActions` call.
+    mapping(address => bool) public shareTaxExempt;
 
     event BlacklistPolicyUpdated(address indexed oldAddress, address indexed newAddress);
     event ShareTaxPolicyUpdated(address indexed oldAddress, address indexed newAddress);
+    event ShareTaxExemptUpdated(address indexed account, bool exempt);
 
     constructor(
         string memory name_,
@@ -50,6 +56,25 @@ abstract contract TransferFeeToken is AccessControlRci, ShareholderEnumerableTok
         success = true;
     }
 
+    /*
+    @dev: Caches an exemption of the share tax policy in the token. Only set it for addresses whose transfers, sent or
+    @dev: received, the policy never taxes.
+    */
+    function updateShareTaxExempt(address account, bool exempt)
+    public onlyRole(RCI_CHILD_ADMIN)
+    returns (bool success)
+    {
+        shareTaxExempt[account] = exempt;
+        emit ShareTaxExemptUpdated(account, exempt);
+        success = true;
+    }
+
+    function setCohortMintsCleared(bool cleared)
+    internal
+    {
+        cohortMintsCleared = cleared;
+    }
+
     function transferFeeActive()
     public view
     returns (bool active)
@@ -62,31 +87,78 @@ abstract contract TransferFeeToken is AccessControlRci, ShareholderEnumerableTok
     {
         // `to` is only allowed to be address(0) when it is a burn function.
         // Transfer and mint already prevent setting `to` to address(0).
+        if (from == address(0) && cohortMintsCleared) {
+            return;
+        }
         require(blacklistPolicy.transferPolicy(from, to, amount), "Failed blacklist check.");
     }
 
     function _afterTokenTransfer(address from, address to, uint256 amount)
     internal override
     {
-         if (transferFeeActive()
+        // Tax legs are nested transfers; the outer call updates their holders once below.
+        if (recursionFlag) {
+            return;
+        }
+        if (transferFeeActive()
             && (from != address(0)) // exclude tax when minting
             && (to != address(0)) // exclude tax when burning
-         ) {
-            if (!recursionFlag) {
+            && !(shareTaxExempt[from] || shareTaxExempt[to])
+        ) {
+            IShareTaxPolicy.ShareTaxTransfers[] memory shareTaxTransfers =
+            shareTaxPolicy.shareTaxActions(from, to, amount);
+            // Exempt transfers the token has not cached get no tax legs and skip the flag writes.
+            if (shareTaxTransfers.length > 0) {
                 recursionFlag = true;
-                IShareTaxPolicy.ShareTaxTransfers[] memory shareTaxTransfers =
-                shareTaxPolicy.shareTaxActions(from, to, amount);
                 for (uint i = 0; i < shareTaxTransfers.length; i++) {
+                    if (shareTaxTransfers[i].amount == 0) {
+                        continue;
+                    }
                     _transfer(shareTaxTransfers[i].payer,
                         shareTaxTransfers[i].collector,
                         shareTaxTransfers[i].amount);
+                }
+                recursionFlag = false;
+            }
+
+            for (uint i = 0; i < shareTaxTransfers.length; i++) {
+                // No balance moved for a skipped zero-amount leg.
+                if (shareTaxTransfers[i].amount == 0) {
+                    continue;
+                }
+                if (!holderTouched(shareTaxTransfers, i, shareTaxTransfers[i].payer, from, to)) {
                     updateShareHolders(shareTaxTransfers[i].payer);
+                }
+                if (shareTaxTransfers[i].collector != shareTaxTransfers[i].payer
+                    && !holderTouched(shareTaxTransfers, i, shareTaxTransfers[i].collector, from, to)) {
                     updateShareHolders(shareTaxTransfers[i].collector);
                 }
-                recursionFlag = false;
             }
         }
-        updateShareHolders(from);
-        updateShareHolders(to);
+        if (from != address(0)) {
+            updateShareHolders(from);
+        }
+        if (to != address(0) && to != from) {
+            updateShareHolders(to);
+        }
+    }
+
+    function holderTouched(IShareTaxPolicy.ShareTaxTransfers[] memory shareTaxTransfers, uint256 legsBefore,
+        address account, address from, address to
+    )
+    internal pure
+    returns (bool touched)
+    {
+        if (account == from || account == to) {
+            return true;
+        }
+        for (uint i = 0; i < legsBefore; i++) {
+            if (shareTaxTransfers[i].amount == 0) {
+                continue;
+            }
+            if (shareTaxTransfers[i].payer == account || shareTaxTransfers[i].collector == account) {
+                return true;
+            }
+        }
     }
 }
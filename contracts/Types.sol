@@ -6,4 +6,11 @@ abstract contract Types {
         address user;
         uint256 amount;
     }
+
+    struct ExchangeRecord {
+        address user;
+        uint256 amountIn;
+        uint256 amountOut;
+        uint256 feesPaid;
+    }
 }
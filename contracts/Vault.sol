@@ -8,6 +8,7 @@ import "./RequestManager.sol";
 import "./Processor.sol";
 import "./Types.sol";
 import "./Router.sol";
+import "./VaultMath.sol";
 
 contract Vault is ShareToken, Types {
 
@@ -22,7 +23,7 @@ contract Vault is ShareToken, Types {
     Processor public pendingWithdrawUsdc;
 
     uint256 public nav;
-    uint256 constant public singleUnit = 10 ** 6;
+    uint256 constant public singleUnit = VaultMath.SINGLE_UNIT;
 
     address public onboardingFeeCollector;
     uint256 public onboardingFeePercentage;
@@ -31,6 +32,33 @@ contract Vault is ShareToken, Types {
 
     address public competition;
 
+    uint256 public withdrawalEpochNav;
+    uint256 public withdrawalEpochShares;
+    uint256 public withdrawalEpochRequests;
+
+    mapping(address => uint256) public claimableUsdc;
+    uint256 public totalClaimableUsdc;
+
+    // Settlement cohorts checked by `blacklistVerdicts`.
+    uint8 internal constant DEPOSIT_COHORT = 0;
+    uint8 internal constant WITHDRAW_REQUEST_COHORT = 1;
+    uint8 internal constant WITHDRAW_COMPLETION_COHORT = 2;
+
+    // Holders of pd-USDC indices [startIndex, pageEnd) followed by those of [tailStart, numberOfShareHolders).
+    struct HolderWindow {
+        uint256 startIndex;
+        uint256 pageEnd;
+        uint256 tailStart;
+        address[] holders;
+        uint256[] amounts;
+        bool[] blocked;
+    }
+
+    event WithdrawalClaimed(address indexed user, uint256 amount);
+    event WithdrawalClaimSkipped(address indexed user, uint256 amount);
+    event WithdrawalEpochOpened(uint256 indexed nav);
+    event WithdrawalEpochClosed(uint256 indexed nav, uint256 requests, uint256 sharesBurnt);
+
     constructor(string memory name_, string memory symbol_,
         address usdcToken_, address delegateWallet_,
         address blacklistPolicy_,
@@ -69,13 +97,64 @@ contract Vault is ShareToken, Types {
     external onlyRole(RCI_CHILD_ADMIN)
     {
         updateNav(newNav);
-        uint256 total = 0;
         uint256 onboardingFees = 0;
+        ExchangeRecord[] memory records = new ExchangeRecord[](usersAndAmountsUsdc.length);
+        uint256[] memory blocked = blacklistVerdicts(usersAndAmountsUsdc, DEPOSIT_COHORT, nav);
+        setCohortMintsCleared(true);
         for (uint32 i = 0; i < usersAndAmountsUsdc.length; i++) {
-            onboardingFees += completeSingleDeposit(usersAndAmountsUsdc[i].amount, usersAndAmountsUsdc[i].user);
+            require(!isBlocked(blocked, i), "Blacklisted deposit request.");
+            records[i] = completeSingleDeposit(usersAndAmountsUsdc[i].amount, usersAndAmountsUsdc[i].user);
+            onboardingFees += records[i].feesPaid;
+        }
+        setCohortMintsCleared(false);
+
+        Router(router).updateExchangeRecords(0, records);
+        IERC20Metadata(usdcToken).safeTransfer(onboardingFeeCollector, onboardingFees);
+    }
+
+    /*
+    @dev: Examines up to `maxCount` pending deposit holders from `startIndex` of pd-USDC's holder set and settles each
+    @dev: for their full balance. Blacklisted holders are skipped and stay pending. Settled holders leave the set, so
+    @dev: pass the returned `nextIndex` to the next call; start a new cohort from 0. Deposits made in between are settled
+    @dev: at `newNav`. The holders are read in one page and cleared with one `batchPolicy` call.
+    */
+    function completePendingDeposits(uint256 newNav, uint256 startIndex, uint256 maxCount)
+    external onlyRole(RCI_CHILD_ADMIN)
+    returns (uint256 nextIndex, uint256 remaining)
+    {
+        updateNav(newNav);
+        uint256 holdersCount = pendingDepositUsdc.numberOfShareHolders();
+        require(startIndex <= holdersCount, "Invalid index.");
+        if (maxCount > holdersCount - startIndex) {
+            maxCount = holdersCount - startIndex;
+        }
+        HolderWindow memory window = pendingDepositWindow(startIndex, maxCount, holdersCount);
+
+        uint256 onboardingFees = 0;
+        uint256 settled = 0;
+        ExchangeRecord[] memory records = new ExchangeRecord[](maxCount);
+        nextIndex = startIndex;
+        setCohortMintsCleared(true);
+        for (uint256 examined = 0; examined < maxCount && nextIndex < holdersCount; examined++) {
+            uint256 slot = windowSlot(window, nextIndex);
+            if (window.blocked[slot]) {
+                nextIndex++;
+                continue;
+            }
+            ExchangeRecord memory record = previewSingleDeposit(window.amounts[slot], window.holders[slot]);
+            settleSingleDeposit(window.amounts[slot], record);
+            records[settled++] = record;
+            onboardingFees += record.feesPaid;
+            // The holder is removed from the set and the last holder takes its index.
+            holdersCount--;
+            moveInWindow(window, windowSlot(window, holdersCount), slot);
         }
+        setCohortMintsCleared(false);
+        assembly { mstore(records, settled) } // drop the slots left unused by skipped holders.
 
+        Router(router).updateExchangeRecords(0, records);
         IERC20Metadata(usdcToken).safeTransfer(onboardingFeeCollector, onboardingFees);
+        remaining = holdersCount - nextIndex;
     }
 
     function refundSingleDeposit(uint256 amount, address requester)
@@ -88,27 +167,49 @@ contract Vault is ShareToken, Types {
         Router(router).updateExchangeRecord(requester,  2, requester, 0, amount, 0);
     }
 
-    function processWithdrawals(uint256 newNav, UsersAndAmounts[] memory usersAndAmountsShares)
+    function processWithdrawals(uint256 newNav, UsersAndAmounts[] calldata usersAndAmountsShares)
     external onlyRole(RCI_CHILD_ADMIN)
     {
+        require(withdrawalEpochNav == 0, "Withdrawal epoch open.");
         updateNav(newNav);
-        uint256 unitValue = singleUnit;
-        uint256 totalYShares = 0;
-        address routerAddr = router;
-        string memory symbol = symbol();
-        for (uint32 i = 0; i < usersAndAmountsShares.length; i++) {
-            processSingleWithdrawal(
-                usersAndAmountsShares[i].amount,
-                usersAndAmountsShares[i].user,
-                newNav,
-                unitValue,
-                routerAddr,
-                symbol
-            );
-            emit SharesBurned(usersAndAmountsShares[i].user, usersAndAmountsShares[i].amount);
-            totalYShares += usersAndAmountsShares[i].amount;
-        }
-        burnShares(totalYShares);
+        burnShares(processWithdrawalBatch(newNav, usersAndAmountsShares));
+    }
+
+    /*
+    @dev: Withdrawal epochs split a withdrawal cohort over several transactions at one NAV. Chunks only accumulate the
+    @dev: shares to burn; the total is burnt once when the epoch is closed.
+    */
+    function openWithdrawalEpoch(uint256 newNav)
+    external onlyRole(RCI_CHILD_ADMIN)
+    {
+        require(withdrawalEpochNav == 0, "Withdrawal epoch open.");
+        require(newNav > 0, "Invalid NAV.");
+        updateNav(newNav);
+        withdrawalEpochNav = newNav;
+        emit WithdrawalEpochOpened(newNav);
+    }
+
+    function processWithdrawalEpoch(UsersAndAmounts[] calldata usersAndAmountsShares)
+    external onlyRole(RCI_CHILD_ADMIN)
+    returns (uint256 epochShares)
+    {
+        require(withdrawalEpochNav != 0, "No withdrawal epoch.");
+        epochShares = withdrawalEpochShares + processWithdrawalBatch(withdrawalEpochNav, usersAndAmountsShares);
+        withdrawalEpochShares = epochShares;
+        withdrawalEpochRequests += usersAndAmountsShares.length;
+    }
+
+    function closeWithdrawalEpoch()
+    external onlyRole(RCI_CHILD_ADMIN)
+    returns (uint256 sharesBurnt)
+    {
+        require(withdrawalEpochNav != 0, "No withdrawal epoch.");
+        sharesBurnt = withdrawalEpochShares;
+        burnShares(sharesBurnt);
+        emit WithdrawalEpochClosed(withdrawalEpochNav, withdrawalEpochRequests, sharesBurnt);
+        withdrawalEpochNav = 0;
+        withdrawalEpochShares = 0;
+        withdrawalEpochRequests = 0;
     }
 
     function completeWithdrawals(UsersAndAmounts[] calldata usersAndAmountsUsdc)
@@ -116,7 +217,9 @@ contract Vault is ShareToken, Types {
     {
         uint256 total = 0;
         uint256 withdrawalFees = 0;
+        uint256[] memory blocked = blacklistVerdicts(usersAndAmountsUsdc, WITHDRAW_COMPLETION_COHORT, nav);
         for (uint32 i = 0; i < usersAndAmountsUsdc.length; i++) {
+            require(!isBlocked(blocked, i), "Blacklisted withdraw completion.");
             withdrawalFees += completeSingleWithdrawal(usersAndAmountsUsdc[i].amount, usersAndAmountsUsdc[i].user);
 //            total += usersAndAmountsUsdc[i].amount;
         }
@@ -124,6 +227,59 @@ contract Vault is ShareToken, Types {
         IERC20Metadata(usdcToken).safeTransfer(withdrawalFeeCollector, withdrawalFees);
     }
 
+    /*
+    @dev: Pull-based alternative to `completeWithdrawals`: burns the cohort's pw-USDC in one call and credits the USDC
+    @dev: net of fees to `claimableUsdc`, to be paid out by `claim` or `claimWithdrawals`.
+    */
+    function creditWithdrawals(UsersAndAmounts[] calldata usersAndAmountsUsdc)
+    external onlyRole(RCI_CHILD_ADMIN)
+    {
+        pendingWithdrawUsdc.reclaimPwUsdcBatch(usersAndAmountsUsdc);
+        uint256 withdrawalFees = 0;
+        uint256 totalCredited = 0;
+        for (uint32 i = 0; i < usersAndAmountsUsdc.length; i++) {
+            (uint256 credited, uint256 feesInUsdc) = VaultMath.netOfFee(
+                usersAndAmountsUsdc[i].amount, withdrawalFeePercentage
+            );
+            claimableUsdc[usersAndAmountsUsdc[i].user] += credited;
+            totalCredited += credited;
+            withdrawalFees += feesInUsdc;
+        }
+        totalClaimableUsdc += totalCredited;
+
+        IERC20Metadata(usdcToken).safeTransfer(withdrawalFeeCollector, withdrawalFees);
+        require(IERC20Metadata(usdcToken).balanceOf(address(this)) >= totalClaimableUsdc, "Insufficient USDC.");
+    }
+
+    function claim()
+    external
+    returns (uint256 amount)
+    {
+        amount = claimableUsdc[msg.sender];
+        require(amount > 0, "Nothing to claim.");
+        require(blacklistPolicy.withdrawPolicy(amount, 0, msg.sender, msg.sender), "Blacklisted withdraw completion.");
+        payClaim(msg.sender, amount);
+    }
+
+    /*
+    @dev: Pays out every listed user that has a claim and passes the blacklist check. Users that already claimed or are
+    @dev: blocked are skipped with `WithdrawalClaimSkipped` instead of reverting, so no single user can fail the batch.
+    */
+    function claimWithdrawals(address[] calldata users)
+    external onlyRole(RCI_CHILD_ADMIN)
+    returns (uint256 totalPaid)
+    {
+        for (uint32 i = 0; i < users.length; i++) {
+            uint256 amount = claimableUsdc[users[i]];
+            if (amount == 0 || !blacklistPolicy.withdrawPolicy(amount, 0, users[i], users[i])) {
+                emit WithdrawalClaimSkipped(users[i], amount);
+                continue;
+            }
+            payClaim(users[i], amount);
+            totalPaid += amount;
+        }
+    }
+
     function refundSingleWithdrawal(uint256 amount, address requester)
     external onlyRole(RCI_CHILD_ADMIN)
     {
@@ -152,6 +308,8 @@ contract Vault is ShareToken, Types {
     function settlementOut(uint256 usdcAmount)
     external onlyRole(RCI_CHILD_ADMIN)
     {
+        require(IERC20Metadata(usdcToken).balanceOf(address(this)) >= usdcAmount + totalClaimableUsdc,
+            "Claimable USDC.");
         IERC20Metadata(usdcToken).safeTransfer(delegateWallet, usdcAmount);
     }
 
@@ -178,7 +336,7 @@ contract Vault is ShareToken, Types {
     public onlyRole(RCI_CHILD_ADMIN)
     returns (bool success)
     {
-        require(newFeePercentage <= (100 * singleUnit));
+        require(newFeePercentage <= singleUnit); // at most 100%, which `VaultMath.netOfFee` relies on.
         onboardingFeePercentage = newFeePercentage;
         success = true;
     }
@@ -187,7 +345,7 @@ contract Vault is ShareToken, Types {
     public onlyRole(RCI_CHILD_ADMIN)
     returns (bool success)
     {
-        require(newFeePercentage <= (100 * singleUnit));
+        require(newFeePercentage <= singleUnit); // at most 100%, which `VaultMath.netOfFee` relies on.
         withdrawalFeePercentage = newFeePercentage;
         success = true;
     }
@@ -221,59 +379,203 @@ contract Vault is ShareToken, Types {
 
     function completeSingleDeposit(uint256 pendingDepositUsdcAmt, address receiver)
     internal
-    returns (uint256 feesInUsdc)
+    returns (ExchangeRecord memory record)
     {
         require(pendingDepositUsdcAmt > 0);
+        record = previewSingleDeposit(pendingDepositUsdcAmt, receiver);
+        settleSingleDeposit(pendingDepositUsdcAmt, record);
+    }
 
-        feesInUsdc = calculateFee(pendingDepositUsdcAmt, onboardingFeePercentage);
-        uint256 sharesToMint = (pendingDepositUsdcAmt - feesInUsdc) * singleUnit / nav;
-
-        pendingDepositUsdc.redeem(pendingDepositUsdcAmt, address(this), receiver);
-        require(blacklistPolicy.depositPolicy(pendingDepositUsdcAmt, sharesToMint, receiver, receiver),
-            "Blacklisted deposit request.");
-        shareMint(receiver, sharesToMint);
+    function previewSingleDeposit(uint256 pendingDepositUsdcAmt, address receiver)
+    internal view
+    returns (ExchangeRecord memory record)
+    {
+        (uint256 sharesToMint, uint256 feesInUsdc) = VaultMath.depositOut(
+            pendingDepositUsdcAmt, onboardingFeePercentage, nav
+        );
+        record = ExchangeRecord({
+            user: receiver,
+            amountIn: pendingDepositUsdcAmt - feesInUsdc,
+            amountOut: sharesToMint,
+            feesPaid: feesInUsdc
+        });
+    }
 
-        Router(router).updateExchangeRecord(receiver, 0, receiver, pendingDepositUsdcAmt - feesInUsdc,
-            sharesToMint, feesInUsdc);
-        emit SharesMinted(receiver, sharesToMint);
+    function settleSingleDeposit(uint256 pendingDepositUsdcAmt, ExchangeRecord memory record)
+    internal
+    {
+        pendingDepositUsdc.redeem(pendingDepositUsdcAmt, address(this), record.user);
+        shareMint(record.user, record.amountOut);
+        emit SharesMinted(record.user, record.amountOut);
     }
 
     function completeSingleWithdrawal(uint256 pendingWithdrawalUsdcAmt, address receiver)
     internal
     returns (uint256 feesInUsdc)
     {
-        require(blacklistPolicy.withdrawPolicy(pendingWithdrawalUsdcAmt, 0, receiver, receiver),
-            "Blacklisted withdraw completion.");
         pendingWithdrawUsdc.reclaimPwUsdc(pendingWithdrawalUsdcAmt, receiver);
-        feesInUsdc = calculateFee(pendingWithdrawalUsdcAmt, withdrawalFeePercentage);
-        IERC20Metadata(usdcToken).safeTransfer(receiver, pendingWithdrawalUsdcAmt - feesInUsdc);
+        uint256 payout;
+        (payout, feesInUsdc) = VaultMath.netOfFee(pendingWithdrawalUsdcAmt, withdrawalFeePercentage);
+        IERC20Metadata(usdcToken).safeTransfer(receiver, payout);
     }
 
-    function processSingleWithdrawal(
-        uint256 pSharesIn, address receiver, uint256 withdrawNav,
-        uint256 unitValue, address routerAddr, string memory symbol)
+    function processWithdrawalBatch(uint256 withdrawNav, UsersAndAmounts[] calldata usersAndAmountsShares)
     internal
-    returns (uint256 pwUsdcOut)
+    returns (uint256 totalYShares)
     {
-        pwUsdcOut = pendingWithdrawUsdc.processSingleWithdrawal(pSharesIn, receiver, withdrawNav, unitValue);
-        require(blacklistPolicy.withdrawPolicy(pwUsdcOut, pSharesIn, receiver, receiver),
-            "Blacklisted withdraw request.");
-        uint256 fee = calculateFee(pwUsdcOut, withdrawalFeePercentage);
-        Router(routerAddr).updateExchangeRecord(receiver, 1, receiver, pSharesIn, pwUsdcOut - fee, fee);
+        uint256[] memory blocked = blacklistVerdicts(usersAndAmountsShares, WITHDRAW_REQUEST_COHORT, withdrawNav);
+        uint256[] memory pwUsdcOut = pendingWithdrawUsdc.processWithdrawalBatch(usersAndAmountsShares, withdrawNav);
+        ExchangeRecord[] memory records = new ExchangeRecord[](usersAndAmountsShares.length);
+        for (uint32 i = 0; i < usersAndAmountsShares.length; i++) {
+            require(!isBlocked(blocked, i), "Blacklisted withdraw request.");
+            records[i] = processSingleWithdrawal(
+                usersAndAmountsShares[i].amount,
+                usersAndAmountsShares[i].user,
+                pwUsdcOut[i]
+            );
+            emit SharesBurned(usersAndAmountsShares[i].user, usersAndAmountsShares[i].amount);
+            totalYShares += usersAndAmountsShares[i].amount;
+        }
+        Router(router).updateExchangeRecords(1, records);
     }
 
-    function updateNav(uint256 newNav)
+    function payClaim(address user, uint256 amount)
     internal
     {
-        if (newNav != nav) {
-            nav = newNav;
+        claimableUsdc[user] = 0;
+        totalClaimableUsdc -= amount;
+        IERC20Metadata(usdcToken).safeTransfer(user, amount);
+        emit WithdrawalClaimed(user, amount);
+    }
+
+    function processSingleWithdrawal(uint256 pSharesIn, address receiver, uint256 pwUsdcOut)
+    internal view
+    returns (ExchangeRecord memory record)
+    {
+        (uint256 pwUsdcNet, uint256 fee) = VaultMath.netOfFee(pwUsdcOut, withdrawalFeePercentage);
+        record = ExchangeRecord({
+            user: receiver,
+            amountIn: pSharesIn,
+            amountOut: pwUsdcNet,
+            feesPaid: fee
+        });
+    }
+
+    function blacklistVerdicts(UsersAndAmounts[] calldata usersAndAmounts, uint8 cohort, uint256 cohortNav)
+    internal view
+    returns (uint256[] memory blocked)
+    {
+        address[] memory users = new address[](usersAndAmounts.length);
+        uint256[] memory amounts = new uint256[](usersAndAmounts.length);
+        for (uint32 i = 0; i < usersAndAmounts.length; i++) {
+            users[i] = usersAndAmounts[i].user;
+            amounts[i] = usersAndAmounts[i].amount;
         }
+        blocked = blacklistVerdicts(users, amounts, cohort, cohortNav);
     }
 
-    function calculateFee(uint256 amount, uint256 feePercentage)
+    /*
+    @dev: Policies without `batchPolicy`, e.g. those deployed before it was added to `IBlacklistPolicy` or whose verdict
+    @dev: depends on the amount, revert on it. Their cohorts fall back to one call per user with the settlement amounts.
+    */
+    function blacklistVerdicts(address[] memory users, uint256[] memory amounts, uint8 cohort, uint256 cohortNav)
     internal view
-    returns (uint256 fee)
+    returns (uint256[] memory blocked)
     {
-        fee = amount * feePercentage / singleUnit;
+        try blacklistPolicy.batchPolicy(users) returns (uint256[] memory verdicts) {
+            return verdicts;
+        } catch {
+            blocked = new uint256[]((users.length + 255) / 256);
+            for (uint256 i = 0; i < users.length; i++) {
+                if (!singleBlacklistVerdict(users[i], amounts[i], cohort, cohortNav)) {
+                    blocked[i >> 8] |= 1 << (i & 255);
+                }
+            }
+        }
+    }
+
+    /*
+    @dev: The per-user policy calls a settlement made before `batchPolicy`: the deposit policy and the share mint for a
+    @dev: deposit of `amount` USDC, the withdraw policy for a request of `amount` shares or a completion of `amount`
+    @dev: pw-USDC.
+    */
+    function singleBlacklistVerdict(address user, uint256 amount, uint8 cohort, uint256 cohortNav)
+    internal view
+    returns (bool allowed)
+    {
+        if (cohort == DEPOSIT_COHORT) {
+            (uint256 sharesOut, ) = VaultMath.depositOut(amount, onboardingFeePercentage, cohortNav);
+            allowed = blacklistPolicy.depositPolicy(amount, sharesOut, user, user)
+                && blacklistPolicy.transferPolicy(address(0), user, sharesOut);
+        } else if (cohort == WITHDRAW_REQUEST_COHORT) {
+            allowed = blacklistPolicy.withdrawPolicy(VaultMath.sharesToUsdc(amount, cohortNav), amount, user, user);
+        } else {
+            allowed = blacklistPolicy.withdrawPolicy(amount, 0, user, user);
+        }
+    }
+
+    /*
+    @dev: pd-USDC holders `completePendingDeposits` can reach from `startIndex`: the page of `count` holders, and the
+    @dev: last `count` holders, which swap-and-pop removal moves into the page as holders settle.
+    */
+    function pendingDepositWindow(uint256 startIndex, uint256 count, uint256 holdersCount)
+    internal view
+    returns (HolderWindow memory window)
+    {
+        window.startIndex = startIndex;
+        window.pageEnd = startIndex + count;
+        window.tailStart = holdersCount - count > window.pageEnd ? holdersCount - count : window.pageEnd;
+        (address[] memory page, uint256[] memory pageAmounts, ) =
+            pendingDepositUsdc.getShareHoldersWithBalances(startIndex, count);
+        (address[] memory tail, uint256[] memory tailAmounts, ) =
+            pendingDepositUsdc.getShareHoldersWithBalances(window.tailStart, holdersCount - window.tailStart);
+
+        window.holders = new address[](page.length + tail.length);
+        window.amounts = new uint256[](page.length + tail.length);
+        for (uint256 i = 0; i < page.length; i++) {
+            window.holders[i] = page[i];
+            window.amounts[i] = pageAmounts[i];
+        }
+        for (uint256 i = 0; i < tail.length; i++) {
+            window.holders[page.length + i] = tail[i];
+            window.amounts[page.length + i] = tailAmounts[i];
+        }
+        uint256[] memory blocked = blacklistVerdicts(window.holders, window.amounts, DEPOSIT_COHORT, nav);
+        window.blocked = new bool[](window.holders.length);
+        for (uint256 i = 0; i < window.holders.length; i++) {
+            window.blocked[i] = isBlocked(blocked, i);
+        }
+    }
+
+    function moveInWindow(HolderWindow memory window, uint256 fromSlot, uint256 toSlot)
+    internal pure
+    {
+        window.holders[toSlot] = window.holders[fromSlot];
+        window.amounts[toSlot] = window.amounts[fromSlot];
+        window.blocked[toSlot] = window.blocked[fromSlot];
+    }
+
+    function windowSlot(HolderWindow memory window, uint256 index)
+    internal pure
+    returns (uint256 slot)
+    {
+        slot = index < window.pageEnd
+            ? index - window.startIndex
+            : window.pageEnd - window.startIndex + index - window.tailStart;
+    }
+
+    function isBlocked(uint256[] memory blocked, uint256 index)
+    internal pure
+    returns (bool)
+    {
+        return blocked[index >> 8] & (1 << (index & 255)) != 0;
+    }
+
+    function updateNav(uint256 newNav)
+    internal
+    {
+        if (newNav != nav) {
+            nav = newNav;
+        }
     }
 }
@@ -0,0 +1,51 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.15;
+
+library VaultMath {
+
+    /*
+    @dev: Fee and NAV conversions shared by the Vault and Processor. Mirrored off-chain by `yiedl/vault_math.py`,
+    @dev: which must round the same way (every division rounds down).
+    */
+
+    uint256 internal constant SINGLE_UNIT = 10 ** 6;
+
+    function fee(uint256 amount, uint256 feePercentage)
+    internal pure
+    returns (uint256)
+    {
+        return amount * feePercentage / SINGLE_UNIT;
+    }
+
+    function usdcToShares(uint256 usdcAmount, uint256 nav)
+    internal pure
+    returns (uint256)
+    {
+        return usdcAmount * SINGLE_UNIT / nav;
+    }
+
+    function sharesToUsdc(uint256 shareAmount, uint256 nav)
+    internal pure
+    returns (uint256)
+    {
+        return shareAmount * nav / SINGLE_UNIT;
+    }
+
+    function netOfFee(uint256 amount, uint256 feePercentage)
+    internal pure
+    returns (uint256 net, uint256 feeAmount)
+    {
+        feeAmount = fee(amount, feePercentage);
+        // The Vault caps fee percentages at SINGLE_UNIT (100%), so feeAmount <= amount.
+        unchecked { net = amount - feeAmount; }
+    }
+
+    function depositOut(uint256 usdcIn, uint256 feePercentage, uint256 nav)
+    internal pure
+    returns (uint256 sharesOut, uint256 feeAmount)
+    {
+        uint256 net;
+        (net, feeAmount) = netOfFee(usdcIn, feePercentage);
+        sharesOut = usdcToShares(net, nav);
+    }
+}
@@ -52,4 +52,17 @@ contract BlacklistPolicyExternal is IBlacklistPolicy, AccessControlRci {
     {
         return _policy(receiver, sender, assets);
     }
+
+    function batchPolicy(address[] calldata users)
+    external view override
+    returns (uint256[] memory blocked)
+    {
+        blocked = new uint256[]((users.length + 255) / 256);
+        for (uint i = 0; i < users.length; i++) {
+            // `_policy` does not depend on the amount.
+            if (!_policy(users[i], users[i], 0)) {
+                blocked[i >> 8] |= 1 << (i & 255);
+            }
+        }
+    }
 }
@@ -0,0 +1,62 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.15;
+
+import "../AccessControlRci.sol";
+
+/*
+@dev: A manual blacklist policy deployed against `IBlacklistPolicy` before `batchPolicy` was added. Deposits and
+@dev: withdrawals of more than `maxAssets` (if set) are refused, so its verdicts depend on the amounts.
+*/
+contract BlacklistPolicyLegacy is AccessControlRci {
+
+    mapping (address => bool) public isBlacklisted;
+    uint256 public maxAssets;
+
+    constructor() {
+        _initializeRciAdmin(msg.sender);
+    }
+
+    function updateBlacklist(address acct, bool toBlacklist)
+    external onlyRole(RCI_CHILD_ADMIN)
+    returns (bool)
+    {
+        isBlacklisted[acct] = toBlacklist;
+        return true;
+    }
+
+    function updateMaxAssets(uint256 newMaxAssets)
+    external onlyRole(RCI_CHILD_ADMIN)
+    returns (bool)
+    {
+        maxAssets = newMaxAssets;
+        return true;
+    }
+
+    function _policy(address from, address to)
+    internal view
+    returns (bool)
+    {
+        return !(isBlacklisted[to] || isBlacklisted[from]);
+    }
+
+    function transferPolicy(address from, address to, uint256 amount)
+    external view
+    returns (bool)
+    {
+        return _policy(from, to);
+    }
+
+    function depositPolicy(uint256 assets, uint256 shares, address receiver, address sender)
+    external view
+    returns (bool)
+    {
+        return _policy(receiver, sender) && (maxAssets == 0 || assets <= maxAssets);
+    }
+
+    function withdrawPolicy(uint256 assets, uint256 shares, address receiver, address sender)
+    external view
+    returns (bool)
+    {
+        return _policy(receiver, sender) && (maxAssets == 0 || assets <= maxAssets);
+    }
+}
@@ -48,4 +48,16 @@ contract BlacklistPolicyManual is IBlacklistPolicy, AccessControlRci {
     {
         return _policy(receiver, sender);
     }
+
+    function batchPolicy(address[] calldata users)
+    external view override
+    returns (uint256[] memory blocked)
+    {
+        blocked = new uint256[]((users.length + 255) / 256);
+        for (uint i = 0; i < users.length; i++) {
+            if (!_policy(users[i], users[i])) {
+                blocked[i >> 8] |= 1 << (i & 255);
+            }
+        }
+    }
 }
@@ -0,0 +1,29 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.15;
+
+import "../RequestManager.sol";
+
+/*
+@dev: RequestManager with the holder bookkeeping PendingToken had before it skipped address(0) and no-op movements,
+@dev: kept to compare settlement gas against.
+*/
+contract RequestManagerLegacyHolders is RequestManager {
+    using EnumerableSet for EnumerableSet.AddressSet;
+
+    function _afterTokenTransfer(address from, address to, uint256 amount)
+    internal override
+    {
+        updateShareHolders(from);
+        updateShareHolders(to);
+    }
+
+    function updateShareHolders(address userAddress)
+    internal
+    {
+        if (balanceOf(userAddress) > 0) {
+            shareHolders.add(userAddress);
+        } else {
+            shareHolders.remove(userAddress);
+        }
+    }
+}
@@ -17,4 +17,13 @@ interface IBlacklistPolicy{
 
     function withdrawPolicy(uint256 assets, uint256 shares, address receiver, address sender)
     external view returns (bool);
+
+    /*
+    @dev: Verdict for a whole settlement cohort in one call. Bit `i % 256` of word `i / 256` is set if `users[i]` may
+    @dev: not settle, i.e. would fail the deposit, withdraw or mint/burn transfer policy as both sender and receiver.
+    @dev: The verdict must not depend on the settled amounts. Policies whose verdict does should revert here; the Vault
+    @dev: then calls the per-user policies with each user's amounts instead.
+    */
+    function batchPolicy(address[] calldata users)
+    external view returns (uint256[] memory blocked);
 }
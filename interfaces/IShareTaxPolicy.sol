@@ -11,8 +11,8 @@ interface IShareTaxPolicy{
 
     /*
     @dev: Abstraction for external share tax policy contract.
-    @dev: The only function here, shareTaxActions, returns an array of taxes to be paid
-    @dev: along with the payer and collector addresses.
+    @dev: shareTaxActions returns an array of taxes to be paid along with the payer and collector addresses.
+    @dev: Untaxed transfers should get an empty array without computing any tax; the token then skips the tax legs.
     */
     function shareTaxActions(address from, address to, uint256 amount)
     external view
@@ -1,12 +1,50 @@
+import copy
 import decimal
 from brownie import Router, RequestManager, Processor, Vault, MyERC20, DefaultBlacklistPolicy, TestERC20
-from brownie import BlacklistPolicyWhitelist, ShareTaxPolicyVanilla, BlacklistPolicyManual
+from brownie import BlacklistPolicyWhitelist, ShareTaxPolicyVanilla, ShareTaxPolicyCompact, BlacklistPolicyManual
 from brownie import accounts, reverts, project, chain
 from utils import *
 
 
+def copy_attributes(attributes: dict) -> dict:
+    # Contracts and accounts are shared; containers are copied so one test cannot leak into the next.
+    return {name: copy.copy(value) if isinstance(value, (list, dict, set)) else value
+            for name, value in attributes.items()}
+
+
 class BaseTest:
+    # Set to False in a test class that needs every test to deploy from scratch.
+    reuse_deployment = True
+    # (module, class, variant), chain height, block hash and test attributes of the last deployment.
+    _deployment = None
+
     def setup_default_blacklist(self):
+        self.deploy_or_revert("default_blacklist", self.deploy_default_blacklist)
+
+    def setup_whitelist(self):
+        self.deploy_or_revert("whitelist", self.deploy_whitelist)
+
+    def deploy_or_revert(self, variant: str, deploy):
+        """
+        Deploy once per test class and variant, snapshot the chain, and revert to that snapshot for later tests.
+        Brownie keeps a single snapshot, so a test that takes its own snapshot costs the next test a redeployment.
+        """
+        key = (type(self).__module__, type(self).__qualname__, variant)
+        deployment = BaseTest._deployment
+        if self.reuse_deployment and deployment is not None and deployment[0] == key:
+            try:
+                chain.revert()
+            except ValueError:  # the snapshot was dropped by `chain.reset()`.
+                pass
+            else:
+                if (chain.height, chain[-1].hash) == deployment[1:3]:
+                    self.__dict__.update(copy_attributes(deployment[3]))
+                    return
+        deploy()
+        chain.snapshot()
+        BaseTest._deployment = (key, chain.height, chain[-1].hash, copy_attributes(self.__dict__))
+
+    def deploy_default_blacklist(self):
         self.before_setup_hook()
         assert len(accounts) >= 10, "Please run test with at least 10 accounts."
         self.admin, self.client1, self.client2, self.client3, self.client4, self.client5 = accounts[0:6]
@@ -63,7 +101,7 @@ class BaseTest:
 
         self.after_setup_hook()
 
-    def setup_whitelist(self):
+    def deploy_whitelist(self):
         self.before_setup_hook()
         assert len(accounts) >= 10, "Please run test with at least 10 accounts."
         self.admin, self.client1, self.client2, self.client3, self.client4, self.client5 = accounts[0:6]
@@ -153,10 +191,10 @@ class BaseTest:
         return uint / self.single_unit
 
     def usdc2shares(self, usdc_in: int, nav: int):
-        return usdc_in * self.single_unit // nav
+        return vault_math.usdc_to_shares(usdc_in, nav)
 
     def shares2usdc(self, shares_in: int, nav: int):
-        return shares_in * nav // self.single_unit
+        return vault_math.shares_to_usdc(shares_in, nav)
 
     def print_all_balances(self, user):
         header = f"\n===== User: {user} ====="
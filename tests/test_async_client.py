@@ -0,0 +1,51 @@
+import asyncio
+import aiohttp
+from brownie import Multicall, web3
+from base import *
+from yiedl.async_client import AsyncRpc, VaultMonitor
+from yiedl.client import VaultClient
+
+
+class TestVaultMonitor(BaseTest):
+    def after_setup_hook(self):
+        self.multicall = Multicall.deploy(fr(self.admin))
+        self.second_vault = Vault.deploy("SHORT FUND", "ySHORT", self.usdc, self.dydx_delegate,
+                                         self.default_blacklist_policy, self.request_manager_impl, self.processor_impl,
+                                         self.onboarding_fee_pct, self.withdrawal_fee_pct, fr(self.admin))
+        self.second_vault.updateRouter(self.router, fr(self.admin))
+        self.router.authorizeVault(self.second_vault, fr(self.admin))
+
+    def test_snapshot_all(self):
+        amount = 100 * 1000000
+        self.usdc.approve(self.router, self.max_uint, fr(self.client1))
+        self.router.depositRequest(self.vault, amount, self.client1, fr(self.client1))
+        self.router.depositRequest(self.second_vault, amount // 2, self.client2, fr(self.client1))
+        self.vault.completeDeposits(1100000, [[self.client1, amount]], fr(self.admin))
+        users = [self.client1, self.client2, self.client3]
+
+        async def monitor():
+            async with AsyncRpc(web3.provider.endpoint_uri, max_concurrency=4) as rpc:
+                monitor = VaultMonitor(rpc, self.router.address, self.multicall.address, batch_size=10)
+                vaults = await monitor.vaults()
+                snapshots = await monitor.snapshot_all(users)
+                return vaults, snapshots, rpc.requests
+
+        vaults, snapshots, requests = asyncio.run(monitor())
+        verify([self.vault.address, self.second_vault.address], vaults)
+        verify(set(vaults), set(snapshots))
+        for vault in vaults:
+            expected = VaultClient(web3, vault, self.multicall.address).snapshot(users)
+            verify(expected, snapshots[vault])
+        verify(0, snapshots[self.second_vault.address]["vault"]["total_supply"])
+        verify(amount // 2, snapshots[self.second_vault.address]["users"][self.client2.address]["pending_deposit_usdc"])
+        print(f"\n{len(vaults)} vaults in {requests} requests")
+
+    def test_retry(self):
+        async def unreachable():
+            async with AsyncRpc("http://127.0.0.1:9", retries=2, backoff=0) as rpc:
+                try:
+                    await rpc.block_number()
+                except aiohttp.ClientConnectionError:
+                    return rpc.requests
+
+        verify(3, asyncio.run(unreachable()))
@@ -0,0 +1,33 @@
+import time
+from base import *
+
+
+class TestDeploymentReuse(BaseTest):
+    # chain height before each deployment made for this class.
+    deployments = []
+    setup_seconds = []
+
+    def setup_method(self):
+        started = time.perf_counter()
+        super().setup_method()
+        type(self).setup_seconds.append(time.perf_counter() - started)
+
+    def deploy_default_blacklist(self):
+        type(self).deployments.append(chain.height)
+        super().deploy_default_blacklist()
+
+    def test_mutate_state(self):
+        verify(1, len(self.deployments))
+        self.vault.manualMint(1000 * 1000000, self.client1, fr(self.admin))
+        self.pending_users = [self.client1]
+        verify(1000 * 1000000, self.vault.balanceOf(self.client1))
+
+    def test_state_restored(self):
+        # the second test of the class reverts to the first test's deployment instead of deploying again.
+        verify(1, len(self.deployments))
+        verify(BaseTest._deployment[1], chain.height)
+        verify(BaseTest._deployment[2], chain[-1].hash)
+        verify(0, self.vault.balanceOf(self.client1))
+        verify(0, self.vault.totalSupply())
+        verify(False, hasattr(self, "pending_users"))
+        print(f"\nsetup: {self.setup_seconds[0]:.2f}s deploying, {self.setup_seconds[-1]:.2f}s reverting")
@@ -0,0 +1,93 @@
+import hashlib
+from brownie import BlacklistPolicyBloom
+from brownie import accounts, reverts
+from brownie.convert import to_address
+from utils import *
+from yiedl.bloom import chunks, filter_words, locate, false_positive_rate
+
+
+def address_list(prefix: str, size: int) -> list:
+    return [to_address("0x" + hashlib.sha256(f"{prefix}-{i}".encode()).hexdigest()[:40]) for i in range(size)]
+
+
+class TestBlacklistPolicyBloom:
+    filter_word_bits = 10
+    sanctioned_count = 10000
+
+    def setup_method(self):
+        self.admin, self.client1, self.client2 = accounts[0:3]
+        self.zero_address = "0x" + ("00" * 20)
+        self.policy = BlacklistPolicyBloom.deploy(self.filter_word_bits, fr(self.admin))
+
+    def in_filter(self, words: dict, address: str) -> bool:
+        word_index, mask = locate(address, self.policy.generation(), self.filter_word_bits)
+        return words.get(word_index, 0) & mask == mask
+
+    def test_update_blacklist(self):
+        with reverts(): BlacklistPolicyBloom.deploy(25, fr(self.admin))
+        with reverts(): self.policy.addToBlacklist([self.client1], fr(self.client1))
+        with reverts(): self.policy.mergeFilterWords([0], [1], fr(self.client1))
+        with reverts(): self.policy.mergeFilterWords([0], [], fr(self.admin))
+        with reverts(): self.policy.mergeFilterWords([2 ** self.filter_word_bits], [1], fr(self.admin))
+        with reverts(): self.policy.updateClearance(self.client1, True, fr(self.client1))
+        with reverts(): self.policy.resetBlacklist(fr(self.client1))
+
+        verify(False, self.policy.isBlacklisted(self.client1))
+        self.policy.addToBlacklist([self.client1], fr(self.admin))
+        verify(True, self.policy.isBlacklisted(self.client1))
+        verify(False, self.policy.isBlacklisted(self.zero_address))
+        verify(False, self.policy.transferPolicy(self.zero_address, self.client1, 1))
+        verify(False, self.policy.depositPolicy(1, 1, self.client2, self.client1))
+        verify(False, self.policy.withdrawPolicy(1, 1, self.client1, self.client2))
+        verify(True, self.policy.transferPolicy(self.zero_address, self.client2, 1))
+        verify([2], list(self.policy.batchPolicy([self.client2, self.client1])))
+
+        # clearance overrides the filter, a reset drops the whole list.
+        self.policy.updateClearance(self.client1, True, fr(self.admin))
+        verify(False, self.policy.isBlacklisted(self.client1))
+        self.policy.updateClearance(self.client1, False, fr(self.admin))
+        verify(True, self.policy.isBlacklisted(self.client1))
+        self.policy.resetBlacklist(fr(self.admin))
+        verify(1, self.policy.generation())
+        verify(False, self.policy.isBlacklisted(self.client1))
+
+    def test_bulk_load(self):
+        sanctioned = address_list("sanctioned", self.sanctioned_count)
+        clean = address_list("clean", 300)
+        words = filter_words(sanctioned, self.policy.generation(), self.filter_word_bits)
+        print(f"\n{len(sanctioned)} addresses in {len(words)} words, "
+              f"expected false positive rate {false_positive_rate(words, self.filter_word_bits):.4%}")
+
+        merge_gas = 0
+        for word_indexes, masks in chunks(words, 256):
+            merge_gas += self.policy.mergeFilterWords(word_indexes, masks, fr(self.admin)).gas_used
+        print(f"mergeFilterWords: {merge_gas} gas, {merge_gas // len(sanctioned)} per address")
+        for word_index in list(words)[:20]:
+            verify(words[word_index], self.policy.filterWord(word_index))
+
+        # adding on-chain hashes the same way as the off-chain builder.
+        extra = address_list("extra", 200)
+        add_gas = self.policy.addToBlacklist(extra, fr(self.admin)).gas_used
+        print(f"addToBlacklist: {add_gas} gas, {add_gas // len(extra)} per address")
+        for address in extra:
+            word_index, mask = locate(address, self.policy.generation(), self.filter_word_bits)
+            words[word_index] = words.get(word_index, 0) | mask
+
+        for address in sanctioned[::100] + extra[::10]:
+            verify(True, self.policy.isBlacklisted(address))
+        false_positives = [address for address in clean if self.in_filter(words, address)]
+        for address in clean:
+            verify(address in false_positives, self.policy.isBlacklisted(address))
+        for address in false_positives:
+            self.policy.updateClearance(address, True, fr(self.admin))
+            verify(False, self.policy.isBlacklisted(address))
+
+        hit_gas = self.policy.isBlacklisted.estimate_gas(sanctioned[0])
+        miss_gas = min(self.policy.isBlacklisted.estimate_gas(address) for address in clean[:10])
+        print(f"isBlacklisted: {hit_gas} gas when listed, {miss_gas} gas when clean")
+        verify(True, miss_gas <= hit_gas)
+
+        cohort = sanctioned[:5] + clean[:251]
+        blocked = self.policy.batchPolicy(cohort)
+        verify(2, len(blocked))
+        verify(set(range(5)), {i for i in range(len(cohort)) if blocked[i // 256] >> (i % 256) & 1})
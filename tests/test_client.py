@@ -0,0 +1,55 @@
+from brownie import Multicall, web3
+from base import *
+from yiedl.client import Call, VaultClient
+
+
+class TestVaultClient(BaseTest):
+    def after_setup_hook(self):
+        self.multicall = Multicall.deploy(fr(self.admin))
+        self.client = VaultClient(web3, self.vault.address, self.multicall.address, batch_size=20)
+
+    def test_snapshot(self):
+        amount = 100 * 1000000
+        self.usdc.approve(self.router, self.max_uint, fr(self.client1))
+        self.vault.approve(self.router, self.max_uint, fr(self.client1))
+        self.router.depositRequest(self.vault, amount, self.client1, fr(self.client1))
+        self.router.depositRequest(self.vault, amount, self.client2, fr(self.client1))
+        self.vault.completeDeposits(1100000, [[self.client1, amount]], fr(self.admin))
+        self.router.withdrawRequest(self.vault, amount // 4, self.client3, fr(self.client1))
+        self.vault.processWithdrawals(1100000, [[self.client3, amount // 8]], fr(self.admin))
+
+        verify(self.usdc.address, self.client.addresses["usdc"])
+        verify(self.withdraw_processor.address, self.client.addresses["pending_withdraw_usdc"])
+        users = [self.client1, self.client2, self.client3, self.client4]
+        eth_calls = self.client.multicall.eth_calls
+        snapshot = self.client.snapshot(users)
+        # 14 vault-level reads and 6 per user, in batches of 20.
+        verify(2, self.client.multicall.eth_calls - eth_calls)
+        verify(chain.height, snapshot["block"])
+
+        verify(self.vault.totalSupply(), snapshot["vault"]["total_supply"])
+        verify(self.vault.nav(), snapshot["vault"]["nav"])
+        verify(self.vault.onboardingFeePercentage(), snapshot["vault"]["onboarding_fee_percentage"])
+        verify(self.vault.withdrawalFeePercentage(), snapshot["vault"]["withdrawal_fee_percentage"])
+        verify(self.vault.numberOfShareHolders(), snapshot["vault"]["number_of_share_holders"])
+        verify(self.usdc.balanceOf(self.vault), snapshot["vault"]["usdc_balance"])
+        for token, contract in [("pending_deposit_usdc", self.deposit_request_mgr),
+                                ("pending_withdraw_share", self.withdraw_request_mgr),
+                                ("pending_withdraw_usdc", self.withdraw_processor)]:
+            verify(contract.totalSupply(), snapshot[token]["total_supply"])
+            verify(contract.numberOfShareHolders(), snapshot[token]["number_of_share_holders"])
+        for user in users:
+            balances = snapshot["users"][user.address]
+            verify(self.usdc.balanceOf(user), balances["usdc"])
+            verify(self.vault.balanceOf(user), balances["vault"])
+            verify(self.deposit_request_mgr.balanceOf(user), balances["pending_deposit_usdc"])
+            verify(self.withdraw_request_mgr.balanceOf(user), balances["pending_withdraw_share"])
+            verify(self.withdraw_processor.balanceOf(user), balances["pending_withdraw_usdc"])
+            verify(self.vault.claimableUsdc(user), balances["claimable_usdc"])
+
+        # a call that reverts does not fail the batch.
+        block, values = self.client.multicall.aggregate([
+            Call(self.vault.address, "getShareHolders(uint256,uint256)", "address[]", ("uint256", "uint256"), (5, 1)),
+            Call(self.vault.address, "nav()", "uint256"),
+        ])
+        verify([None, self.vault.nav()], values)
@@ -103,6 +103,33 @@ class TestERC4626:
                          )
             verify(after_share_bal - before_share_bal, tx.return_value)
 
+    def test_record_deposit(self):
+        assets_list = [random.randint(100000, 200000000) for _ in range(self.samples)]
+        with reverts(): self.request_manager.recordDeposit(assets_list[0], self.client2, fr(self.client2))
+        with reverts(): self.request_manager.recordDeposit(0, self.client2, fr(self.client1))
+        for assets in assets_list:
+            before_share_bal = self.request_manager.balanceOf(self.client2)
+            before_total_assets = self.request_manager.totalAssets()
+            before_asset_bal = self.usdc.balanceOf(self.client1)
+            tx = self.request_manager.recordDeposit(assets, self.client2, fr(self.client1))
+            verify(assets, self.request_manager.balanceOf(self.client2) - before_share_bal)
+            verify(assets, self.request_manager.totalAssets() - before_total_assets)
+            verify(before_asset_bal, self.usdc.balanceOf(self.client1))
+            verify(0, self.usdc.balanceOf(self.request_manager))
+            verify_event([('sender', self.client1.address),
+                          ('owner', self.client2.address),
+                          ('assets', assets),
+                          ('shares', assets)],
+                         tx.events['Deposit'].items()
+                         )
+
+        before_supply = self.request_manager.totalSupply()
+        with reverts(): self.request_manager.recordDepositBatch(assets_list[:2], [self.client3], fr(self.client1))
+        self.request_manager.recordDepositBatch(assets_list[:2], [self.client3, self.client4], fr(self.client1))
+        verify(assets_list[0], self.request_manager.balanceOf(self.client3))
+        verify(assets_list[1], self.request_manager.balanceOf(self.client4))
+        verify(sum(assets_list[:2]), self.request_manager.totalSupply() - before_supply)
+
     def test_max_mint(self):
         verify(2 ** 256 - 1, self.request_manager.maxMint(self.client1))
 
@@ -268,4 +295,25 @@ class TestERC4626:
                           ('shares', shares)],
                          tx.events['Withdraw'].items()
                          )
-            verify(tx.return_value, after_asset_bal - before_asset_bal)
\ No newline at end of file
+            verify(tx.return_value, after_asset_bal - before_asset_bal)
+
+    def test_redeem_batch(self):
+        owners = [self.client2, self.client3, self.client4]
+        share_list = [random.randint(int(dec('0.1e6')), int(dec('200e6'))) for _ in owners]
+        for owner, shares in zip(owners, share_list):
+            self.usdc.increaseAllowance(self.request_manager, shares, fr(self.client1))
+            self.request_manager.mint(shares, owner, fr(self.client1))
+        before_supply = self.request_manager.totalSupply()
+        before_asset_bal = self.usdc.balanceOf(self.client5)
+
+        with reverts(): self.request_manager.redeemBatch(list(zip(owners, share_list)), self.client5, fr(self.client2))
+        with reverts(): self.request_manager.redeemBatch([[self.client2, share_list[0] + 1]], self.client5,
+                                                         fr(self.client1))
+        tx = self.request_manager.redeemBatch(list(zip(owners, share_list)), self.client5, fr(self.client1))
+        verify(0, tx.return_value)
+        verify(before_asset_bal, self.usdc.balanceOf(self.client5))
+        verify(sum(share_list), before_supply - self.request_manager.totalSupply())
+        for owner in owners:
+            verify(0, self.request_manager.balanceOf(owner))
+        verify(len(owners), len(tx.events['Withdraw']))
+
@@ -0,0 +1,56 @@
+from brownie import web3
+from base import *
+from yiedl.holder_cache import HolderCache
+
+
+class TestHolderCache(BaseTest):
+    def after_setup_hook(self):
+        self.usdc.approve(self.router, self.max_uint, fr(self.client1))
+        self.usdc.approve(self.router, self.max_uint, fr(self.client2))
+        self.vault.approve(self.router, self.max_uint, fr(self.client1))
+        self.pending_tokens = [self.deposit_request_mgr, self.withdraw_request_mgr, self.withdraw_processor]
+
+    def verify_cache(self):
+        verify([], self.cache.check())
+        for token in self.pending_tokens:
+            holders, balances, _ = token.getShareHoldersWithBalances(0, self.max_uint)
+            verify(dict(zip(holders, balances)), self.cache.balances(token))
+
+    def test_holder_cache(self):
+        amount = 100 * 1000000
+        self.cache = HolderCache(web3, [token.address for token in self.pending_tokens], reorg_depth=4)
+        self.router.depositRequest(self.vault, amount, self.client1, fr(self.client1))
+        self.router.depositRequest(self.vault, amount, self.client3, fr(self.client1))
+        verify(0, self.cache.sync())
+        self.verify_cache()
+
+        # transfers are applied block by block, holders drop out when their balance reaches zero.
+        self.router.depositRequest(self.vault, amount, self.client2, fr(self.client2))
+        self.vault.completeDeposits(1000000, [[self.client1, amount], [self.client3, amount // 2]], fr(self.admin))
+        self.router.withdrawRequest(self.vault, amount // 4, self.client4, fr(self.client1))
+        self.vault.processWithdrawals(1000000, [[self.client4, amount // 8]], fr(self.admin))
+        verify(True, self.cache.sync() > 0)
+        verify(chain.height, self.cache.last_block)
+        verify(False, self.client1.address in self.cache.holders(self.deposit_request_mgr))
+        self.verify_cache()
+
+        # blocks that are reorganised away are rolled back.
+        chain.snapshot()
+        self.router.depositRequest(self.vault, amount, self.client5, fr(self.client1))
+        self.vault.completeDeposits(1000000, [[self.client2, amount]], fr(self.admin))
+        self.cache.sync()
+        verify(True, self.client5.address in self.cache.holders(self.deposit_request_mgr))
+        chain.revert()
+        self.router.depositRequest(self.vault, amount, self.client1, fr(self.client2))
+        self.cache.sync()
+        verify(False, self.client5.address in self.cache.holders(self.deposit_request_mgr))
+        self.verify_cache()
+
+        # a reorg deeper than the journal reseeds.
+        chain.snapshot()
+        chain.mine(6)
+        self.cache.sync()
+        chain.revert()
+        self.router.depositRequest(self.vault, amount, self.client4, fr(self.client2))
+        verify(0, self.cache.sync())
+        self.verify_cache()
@@ -0,0 +1,80 @@
+import json
+import pytest
+from yiedl.planner import GasModel, pack, plan_deposits, plan_withdrawal_completions, plan_withdrawal_processing, \
+    select_within
+
+
+def users(count: int) -> list:
+    return ["0x" + f"{i + 1:040x}" for i in range(count)]
+
+
+class TestPlanner:
+    model = GasModel(fixed=100000, per_user=50000)
+
+    def test_gas_model(self, tmp_path):
+        report = tmp_path / "gas_benchmark.json"
+        report.write_text(json.dumps({"summary": {
+            "completeDeposits": {"fixed_gas": 60000, "marginal_gas_per_user": 45000},
+            "processWithdrawals": {"fixed_gas": None, "marginal_gas_per_user": None},
+        }}))
+        model = GasModel.from_report(str(report), "completeDeposits")
+        assert model == GasModel(60000, 45000)
+        assert model.gas(10) == 510000
+        assert model.max_users(510000) == 10
+        with pytest.raises(ValueError):
+            GasModel.from_report(str(report), "processWithdrawals")
+        with pytest.raises(ValueError):
+            model.max_users(100000)
+        # a fit with no marginal cost per user would allow unbounded batches.
+        for per_user in [0, -1000]:
+            with pytest.raises(ValueError):
+                GasModel(60000, per_user)
+
+    def test_select_partial(self):
+        holders = users(4)
+        pending = dict(zip(holders, [500, 300, 200, 100]))
+        assert select_within(pending, 650) == [[holders[0], 500], [holders[1], 150]]
+        assert sum(amount for _, amount in select_within(pending, 10 ** 9)) == 1100
+        assert select_within(pending, 0) == []
+
+    def test_select_whole(self):
+        holders = users(5)
+        pending = dict(zip(holders, [70, 60, 50, 40, 1]))
+        # first-fit decreasing finds 70 + 40 + 1 directly.
+        selected = select_within(pending, 111, allow_partial=False)
+        assert sum(amount for _, amount in selected) == 111
+        assert all(pending[user] == amount for user, amount in selected)
+        assert len({user for user, _ in selected}) == len(selected)
+        # first-fit decreasing stops at 70 + 1 = 71; restarting from 60 finds 60 + 40.
+        selected = select_within(pending, 100, allow_partial=False)
+        assert sum(amount for _, amount in selected) == 100
+
+    def test_select_whole_swap(self):
+        holders = users(4)
+        pending = dict(zip(holders, [6, 5, 4, 3]))
+        # the restarts reach 6 + 5 = 11 and 5 + 4 + 3 = 12; swapping 5 for 6 closes the gap.
+        selected = select_within(pending, 13, allow_partial=False, restarts=2)
+        assert sorted(selected) == sorted([[holders[0], 6], [holders[2], 4], [holders[3], 3]])
+
+    def test_pack(self):
+        settlements = [[user, 1] for user in users(25)]
+        batches = pack(settlements, self.model, self.model.gas(10))
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert [s for batch in batches for s in batch] == settlements
+        assert all(self.model.gas(len(batch)) <= self.model.gas(10) for batch in batches)
+        assert pack([], self.model, self.model.gas(10)) == []
+
+    def test_plans(self):
+        holders = users(1000)
+        pending = {user: (i % 50 + 1) * 1000000 for i, user in enumerate(holders)}
+        liquidity = sum(pending.values()) // 3
+        batches = plan_deposits(pending, liquidity, self.model, 15000000)
+        assert sum(amount for batch in batches for _, amount in batch) == liquidity
+        assert all(self.model.gas(len(batch)) <= 15000000 for batch in batches)
+
+        batches = plan_withdrawal_processing(pending, self.model, 15000000)
+        assert sum(len(batch) for batch in batches) == len(holders)
+        assert max(len(batch) for batch in batches) <= self.model.max_users(15000000)
+
+        batches = plan_withdrawal_completions(pending, 10 ** 18, self.model, 15000000)
+        assert {user: amount for batch in batches for user, amount in batch} == pending
@@ -64,7 +64,7 @@ class TestVault(BaseTest):
         with reverts(): self.router.deauthorizeVault(self.vault2, fr(self.admin))
 
         self.router.authorizeVault(self.vault2, fr(self.admin))
-        verify(self.max_uint, self.usdc.allowance(self.router, self.vault2.pendingDepositUsdc()))
+        verify(0, self.usdc.allowance(self.router, self.vault2.pendingDepositUsdc()))
         verify(self.max_uint, self.vault2.allowance(self.router, self.vault2.pendingWithdrawShare()))
         verify(2, self.router.numberOfAuthorizedVaults())
         verify(self.vault.address, self.router.getAuthorizedVault(0))
@@ -82,3 +82,63 @@ class TestVault(BaseTest):
 
 
 
+
+    def holders(self, token):
+        return set(token.getShareHolders(0, token.numberOfShareHolders()))
+
+    def test_pending_token_holders(self):
+        self.vault.updateOnboardingFeePercentage(0, fr(self.admin))
+        amount = 100000000
+        verify(set(), self.holders(self.deposit_request_mgr))
+
+        self.router.depositRequest(self.vault, amount, self.client1, fr(self.client1))
+        self.router.depositRequest(self.vault, amount, self.client1, fr(self.client1))
+        self.router.depositRequest(self.vault, amount, self.client3, fr(self.client2))
+        verify({self.client1, self.client3}, self.holders(self.deposit_request_mgr))
+        verify(2, self.deposit_request_mgr.numberOfShareHolders())
+
+        # partial settlement and refund keep the holder, full settlement removes it.
+        self.vault.completeDeposits(1000000, [[self.client1, amount]], fr(self.admin))
+        self.vault.refundSingleDeposit(amount // 2, self.client3, fr(self.admin))
+        verify({self.client1, self.client3}, self.holders(self.deposit_request_mgr))
+        self.vault.completeDeposits(1000000, [[self.client1, amount], [self.client3, amount // 2]], fr(self.admin))
+        verify(set(), self.holders(self.deposit_request_mgr))
+        verify(0, self.deposit_request_mgr.numberOfShareHolders())
+
+        self.router.withdrawRequest(self.vault, amount, self.client2, fr(self.client1))
+        self.router.withdrawRequest(self.vault, amount, self.client2, fr(self.client1))
+        verify({self.client2}, self.holders(self.withdraw_request_mgr))
+        self.vault.processWithdrawals(1000000, [[self.client2, amount]], fr(self.admin))
+        verify({self.client2}, self.holders(self.withdraw_request_mgr))
+        verify({self.client2}, self.holders(self.withdraw_processor))
+        self.vault.processWithdrawals(1000000, [[self.client2, amount]], fr(self.admin))
+        verify(set(), self.holders(self.withdraw_request_mgr))
+
+        self.vault.completeWithdrawals([[self.client2, amount]], fr(self.admin))
+        verify({self.client2}, self.holders(self.withdraw_processor))
+        self.vault.completeWithdrawals([[self.client2, amount]], fr(self.admin))
+        verify(set(), self.holders(self.withdraw_processor))
+        verify(0, self.withdraw_processor.numberOfShareHolders())
+
+    def test_share_holders_with_balances(self):
+        amount = 100000000
+        self.router.depositRequest(self.vault, amount, self.client1, fr(self.client1))
+        self.router.depositRequest(self.vault, 2 * amount, self.client2, fr(self.client1))
+        self.router.depositRequest(self.vault, 3 * amount, self.client3, fr(self.client2))
+
+        holders, balances, next_index = self.deposit_request_mgr.getShareHoldersWithBalances(0, 2)
+        verify(2, len(holders))
+        verify(2, next_index)
+        last_holders, last_balances, next_index = self.deposit_request_mgr.getShareHoldersWithBalances(next_index, 2)
+        verify(1, len(last_holders))
+        verify(3, next_index)
+        verify({self.client1: amount, self.client2: 2 * amount, self.client3: 3 * amount},
+               dict(zip(list(holders) + list(last_holders), list(balances) + list(last_balances))))
+
+        # pages past the end are clamped instead of reverting.
+        holders, balances, next_index = self.deposit_request_mgr.getShareHoldersWithBalances(5, self.max_uint)
+        verify(0, len(holders))
+        verify(3, next_index)
+        holders, balances, next_index = self.vault.getShareHoldersWithBalances(0, self.max_uint)
+        verify(self.vault.numberOfShareHolders(), next_index)
+        verify([self.vault.balanceOf(holder) for holder in holders], list(balances))
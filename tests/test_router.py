@@ -1,4 +1,6 @@
 from base import *
+from brownie import web3
+from yiedl.indexer import RouterIndexer
 
 class TestVault(BaseTest):
     def before_setup_hook(self):
@@ -64,7 +66,7 @@ class TestVault(BaseTest):
         with reverts(): self.router.deauthorizeVault(self.vault2, fr(self.admin))
 
         self.router.authorizeVault(self.vault2, fr(self.admin))
-        verify(self.max_uint, self.usdc.allowance(self.router, self.vault2.pendingDepositUsdc()))
+        verify(0, self.usdc.allowance(self.router, self.vault2.pendingDepositUsdc()))
         verify(self.max_uint, self.vault2.allowance(self.router, self.vault2.pendingWithdrawShare()))
         verify(2, self.router.numberOfAuthorizedVaults())
         verify(self.vault.address, self.router.getAuthorizedVault(0))
@@ -75,10 +77,102 @@ class TestVault(BaseTest):
         verify(1, self.router.numberOfAuthorizedVaults())
         verify(self.vault.address, self.router.getAuthorizedVault(0))
 
+    def test_batched_exchange_records(self):
+        amount, nav = 100000000, 1250000
+        self.router.depositRequest(self.vault, amount, self.client1, fr(self.client1))
+        self.router.depositRequest(self.vault, amount * 2, self.client2, fr(self.client2))
+        with reverts(): self.router.updateExchangeRecords(0, [[self.client1, amount, 0, 0]], fr(self.admin))
+        tx = self.vault.completeDeposits(nav, [[self.client1, amount], [self.client2, amount * 2]], fr(self.admin))
+
+        for user, deposited in [(self.client1, amount), (self.client2, amount * 2)]:
+            fee = calculate_fee(self.onboarding_fee_pct, deposited)
+            shares = (deposited - fee) * self.single_unit // nav
+            num_requests, num_processed = self.router.numberOfRecords(user)
+            verify((1, 1), (num_requests, num_processed))
+            _, processed = self.router.getRecords(user, 0, num_requests, 0, num_processed)
+            verify(ProcessedRecord([self.vault, REQUEST_TYPE.DEPOSIT, user, tx.timestamp,
+                                    deposited - fee, shares, fee]).to_list(), processed[0])
+            verify(shares, self.vault.balanceOf(user))
+
+    def test_packed_request_records(self):
+        amount = 123456789
+        tx = self.router.depositRequest(self.vault, amount, self.client2, fr(self.client1))
+        exp = RequestRecord([self.vault, REQUEST_TYPE.DEPOSIT, self.client1, self.client2, tx.timestamp, amount])
+        for user in [self.client1, self.client2]:
+            requests, processed = self.router.getRecords(user, 0, 1, 0, 0)
+            verify(exp.to_list(), requests[0])
+            verify(exp.to_list(), self.router.requestRecords(user, 0))
+            verify(0, len(processed))
+
+        # self-requests are stored directly, third-party requests once plus a pointer per user; order is kept.
+        self_tx = self.router.depositRequest(self.vault, amount, self.client1, fr(self.client1))
+        third_party_tx = self.router.depositRequest(self.vault, amount, self.client2, fr(self.client1))
+        self_tx2 = self.router.depositRequest(self.vault, amount, self.client1, fr(self.client1))
+        expected = [
+            exp,
+            RequestRecord([self.vault, REQUEST_TYPE.DEPOSIT, self.client1, self.client1, self_tx.timestamp, amount]),
+            RequestRecord([self.vault, REQUEST_TYPE.DEPOSIT, self.client1, self.client2, third_party_tx.timestamp,
+                           amount]),
+            RequestRecord([self.vault, REQUEST_TYPE.DEPOSIT, self.client1, self.client1, self_tx2.timestamp, amount]),
+        ]
+        verify((4, 0), self.router.numberOfRecords(self.client1))
+        verify([record.to_list() for record in expected], list(self.router.getRecords(self.client1, 0, 4, 0, 0)[0]))
+        verify([expected[0].to_list(), expected[2].to_list()],
+               list(self.router.getRecords(self.client2, 0, 2, 0, 0)[0]))
+        print(f"\ndepositRequest gas: {self_tx2.gas_used} self, {third_party_tx.gas_used} third party")
+        verify(True, self_tx2.gas_used < third_party_tx.gas_used)
+
+    def test_event_only_records(self):
+        indexer = RouterIndexer(self.router.address, start_block=chain.height + 1)
+        verify(True, self.router.recordsInStorage())
+        with reverts(): self.router.updateRecordStorage(False, fr(self.client1))
+        self.router.updateRecordStorage(False, fr(self.admin))
+        verify(False, self.router.recordsInStorage())
 
-
-
-
-
-
-
+        amount = 100000000
+        tx = self.router.depositRequest(self.vault, amount, self.client2, fr(self.client1))
+        tx2 = self.vault.completeDeposits(1000000, [[self.client2, amount]], fr(self.admin))
+        verify((0, 0), self.router.numberOfRecords(self.client1))
+        verify((0, 0), self.router.numberOfRecords(self.client2))
+
+        indexer.sync(web3)
+        fee = calculate_fee(self.onboarding_fee_pct, amount)
+        request = RequestRecord([self.vault, REQUEST_TYPE.DEPOSIT, self.client1, self.client2, tx.timestamp, amount])
+        processed = ProcessedRecord([self.vault, REQUEST_TYPE.DEPOSIT, self.client2, tx2.timestamp,
+                                     amount - fee, amount - fee, fee])
+        verify(([request.to_list()], []), indexer.get_records(self.client1))
+        verify(([request.to_list()], [processed.to_list()]), indexer.get_records(self.client2))
+
+    def test_bulk_requests(self):
+        receivers = [self.client2, self.client3, self.client4]
+        amounts = [100000000, 200000000, 300000000]
+        with reverts(): self.router.bulkDepositRequest(self.vault, amounts[:2], receivers, fr(self.client1))
+        with reverts(): self.router.bulkDepositRequest(self.vault2, amounts, receivers, fr(self.client1))
+
+        usdc_bef, vault_usdc_bef = self.usdc.balanceOf(self.client1), self.usdc.balanceOf(self.vault)
+        tx = self.router.bulkDepositRequest(self.vault, amounts, receivers, fr(self.client1))
+        verify(sum(amounts), usdc_bef - self.usdc.balanceOf(self.client1))
+        verify(sum(amounts), self.usdc.balanceOf(self.vault) - vault_usdc_bef)
+        verify(sum(amounts), self.deposit_request_mgr.totalSupply())
+        verify(sum(amounts), self.deposit_request_mgr.totalAssets())
+        verify(0, self.usdc.balanceOf(self.router))
+        verify(0, self.usdc.balanceOf(self.deposit_request_mgr))
+        verify(len(receivers), self.deposit_request_mgr.numberOfShareHolders())
+        for receiver, amount in zip(receivers, amounts):
+            verify(amount, self.deposit_request_mgr.balanceOf(receiver))
+            record = RequestRecord([self.vault, REQUEST_TYPE.DEPOSIT, self.client1, receiver, tx.timestamp, amount])
+            verify(record.to_list(), self.router.getRecords(receiver, 0, 1, 0, 0)[0][0])
+        verify((len(receivers), 0), self.router.numberOfRecords(self.client1))
+
+        self.vault.completeDeposits(1000000, [[r, a] for r, a in zip(receivers, amounts)], fr(self.admin))
+        self.vault.manualMint(sum(amounts), self.client1, fr(self.admin))
+        shares_bef = self.vault.balanceOf(self.client1)
+        tx = self.router.bulkWithdrawRequest(self.vault, amounts, receivers, fr(self.client1))
+        verify(sum(amounts), shares_bef - self.vault.balanceOf(self.client1))
+        verify(sum(amounts), self.vault.balanceOf(self.vault))
+        verify(0, self.vault.balanceOf(self.router))
+        verify(0, self.vault.balanceOf(self.withdraw_request_mgr))
+        for receiver, amount in zip(receivers, amounts):
+            verify(amount, self.withdraw_request_mgr.balanceOf(receiver))
+            record = RequestRecord([self.vault, REQUEST_TYPE.WITHDRAW, self.client1, receiver, tx.timestamp, amount])
+            verify(record.to_list(), self.router.getRecords(receiver, 1, 2, 0, 0)[0][0])
@@ -1,9 +1,12 @@
 import json
+import os
 from collections import defaultdict
+from hypothesis.database import DirectoryBasedExampleDatabase
 from brownie.test import strategy
 from utils import *
 from brownie import Router, RequestManager, Processor, Vault, MyERC20, DefaultBlacklistPolicy, ShareTaxPolicyVanilla, BlacklistPolicyManual
-from brownie import accounts, reverts, project, chain
+from brownie import accounts, reverts, project, chain, web3
+from yiedl.indexer import RouterIndexer
 
 
 class Balances:
@@ -104,6 +107,7 @@ class YiedlStateMachine:
         self.blacklisted = set()
         self.request_records = defaultdict(lambda: [])
         self.processed_records = defaultdict(lambda: [])
+        self.indexer = RouterIndexer(self.router.address, start_block=chain.height + 1)
 
     def get_balances(self) -> Balances:
         balances = Balances()
@@ -142,6 +146,16 @@ class YiedlStateMachine:
         for i in range(0, len(processed)):
             verify(self.processed_records[user][i].to_list(), processed[i])
 
+        # the event-based history must rebuild exactly what the router keeps in storage.
+        self.indexer.sync(web3)
+        verify((num_request, num_processed), self.indexer.number_of_records(user))
+        indexed_requests, indexed_processed = self.indexer.get_records(user)
+        for i in range(0, len(requests)):
+            verify(indexed_requests[i], requests[i])
+
+        for i in range(0, len(processed)):
+            verify(indexed_processed[i], processed[i])
+
 
     def rule_set_minimum_deposit(self, min_amt):
         with reverts(): self.deposit_request_mgr.updateMinimumDeposit(min_amt, fr(self.client1))
@@ -204,25 +218,28 @@ class YiedlStateMachine:
                 self.deposit_request_mgr.getShareHolders(0, 1)
             return
 
-        verify(self.pd_holders, set(self.deposit_request_mgr.getShareHolders(0, num_pd_holders)))
+        pd_balances, cursor = {}, 0
+        while cursor < num_pd_holders:
+            holders, balances, cursor = self.deposit_request_mgr.getShareHoldersWithBalances(cursor, 2)
+            pd_balances.update(zip(holders, balances))
+        verify(self.pd_holders, set(pd_balances))
         verify(len(self.pd_holders), num_pd_holders)
         users_and_usdc_amounts = []
         old_dydx_off_cahin_bal = self.dydx_off_chain_bal
         for holder in self.pd_holders:
-            pd_bal = self.deposit_request_mgr.balanceOf(holder)
+            pd_bal = pd_balances[holder]
             if pd_bal > self.dydx_off_chain_bal:
                 break
             self.dydx_off_chain_bal -= pd_bal
             users_and_usdc_amounts.append([holder, pd_bal])
-        bef_shares, exp_shares = {}, {}
-        blacklisted_users = 0
-        fees = 0
-        for user, amount in users_and_usdc_amounts:
-            bef_shares[user] = self.vault.balanceOf(user)
-            fee = calculate_fee(self.onboarding_fee_pct, amount)
-            fees += fee
-            exp_shares[user] = (amount - fee) * self.single_unit // nav
-            if user in self.blacklisted: blacklisted_users += 1
+        users = [user for user, _ in users_and_usdc_amounts]
+        cohort_shares, cohort_fees = vault_math.deposit_cohort(
+            [amount for _, amount in users_and_usdc_amounts], self.onboarding_fee_pct, nav
+        )
+        bef_shares = {user: self.vault.balanceOf(user) for user in users}
+        exp_shares = dict(zip(users, cohort_shares))
+        fees = sum(cohort_fees)
+        blacklisted_users = len([user for user in users if user in self.blacklisted])
         bef = self.get_balances()
 
         if blacklisted_users > 0:
@@ -570,8 +587,19 @@ class YiedlStateMachine:
     def invariant_pws_vault_shares(self):
         verify(self.withdraw_request_mgr.totalSupply(), self.vault.balanceOf(self.vault))
 
+def shard_settings() -> dict:
+    """Hypothesis overrides set by `benchmarks/run_stateful_sharded.py`; empty for a plain run."""
+    settings = {}
+    if "YIEDL_STATEFUL_MAX_EXAMPLES" in os.environ:
+        settings["max_examples"] = int(os.environ["YIEDL_STATEFUL_MAX_EXAMPLES"])
+    if "YIEDL_HYPOTHESIS_DB" in os.environ:
+        settings["database"] = DirectoryBasedExampleDatabase(os.environ["YIEDL_HYPOTHESIS_DB"])
+    return settings
+
+
 def test_stateful_fund(accounts, Router, RequestManager, Processor, Vault, MyERC20, DefaultBlacklistPolicy, ShareTaxPolicyVanilla, BlacklistPolicyManual, state_machine):
-    state_machine(YiedlStateMachine, accounts, Router, RequestManager, Processor, Vault, MyERC20, DefaultBlacklistPolicy, ShareTaxPolicyVanilla, BlacklistPolicyManual)
+    state_machine(YiedlStateMachine, accounts, Router, RequestManager, Processor, Vault, MyERC20, DefaultBlacklistPolicy, ShareTaxPolicyVanilla, BlacklistPolicyManual,
+                  settings=shard_settings() or None)
 
 
 
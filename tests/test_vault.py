@@ -1,3 +1,4 @@
+from brownie import BlacklistPolicyLegacy, RequestManagerLegacyHolders
 from base import *
 
 class TestVault(BaseTest):
@@ -34,6 +35,10 @@ class TestVault(BaseTest):
         pct = int(dec("0.2e6"))
         with reverts():
             self.vault.updateOnboardingFeePercentage(pct, fr(self.client1))
+        with reverts():
+            self.vault.updateOnboardingFeePercentage(self.single_unit + 1, fr(self.admin))
+        self.vault.updateOnboardingFeePercentage(self.single_unit, fr(self.admin))
+        verify(self.single_unit, self.vault.onboardingFeePercentage())
         self.vault.updateOnboardingFeePercentage(pct, fr(self.admin))
         verify(pct, self.vault.onboardingFeePercentage())
         self.vault.updateOnboardingFeePercentage(0, fr(self.admin))
@@ -57,6 +62,10 @@ class TestVault(BaseTest):
         pct = int(dec("0.2e6"))
         with reverts():
             self.vault.updateWithdrawalFeePercentage(pct, fr(self.client1))
+        with reverts():
+            self.vault.updateWithdrawalFeePercentage(self.single_unit + 1, fr(self.admin))
+        self.vault.updateWithdrawalFeePercentage(self.single_unit, fr(self.admin))
+        verify(self.single_unit, self.vault.withdrawalFeePercentage())
         self.vault.updateWithdrawalFeePercentage(pct, fr(self.admin))
         verify(pct, self.vault.withdrawalFeePercentage())
         self.vault.updateWithdrawalFeePercentage(0, fr(self.admin))
@@ -232,6 +241,9 @@ class TestVault(BaseTest):
         with reverts(): self.vault.updateShareTaxPolicyAddress(share_tax_policy, fr(self.client1))
         self.vault.updateShareTaxPolicyAddress(share_tax_policy, fr(self.admin))
         verify(share_tax_policy, self.vault.shareTaxPolicy())
+        verify(2, len(share_tax_policy.shareTaxActions(self.client1, self.client2, 1000)))
+        verify(0, len(share_tax_policy.shareTaxActions(self.client1, self.router, 1000)))
+        verify(0, len(share_tax_policy.shareTaxActions(self.withdraw_request_mgr, self.vault, 1000)))
 
         self.usdc.transfer(self.client1, int(1000 * 1e6), fr(self.usdc_source))
         usdc_deposit_amt = self.usdc.balanceOf(self.client1) // 2
@@ -323,6 +335,8 @@ class TestVault(BaseTest):
         share_bal = self.vault.balanceOf(self.client1)
         with reverts(): self.vault.transfer(self.client2, share_bal, fr(self.client1))
         share_tax_policy.updateVip(self.client1, True, fr(self.admin))
+        verify(0, len(share_tax_policy.shareTaxActions(self.client1, self.client2, share_bal)))
+        verify(2, len(share_tax_policy.shareTaxActions(self.client2, self.client1, share_bal)))
         if test_phase:
             with reverts(): self.vault.transfer(self.client2, share_bal, fr(self.client1))
             num_shareholders = self.vault.numberOfShareHolders()
@@ -387,3 +401,330 @@ class TestVault(BaseTest):
 
         verify(shares_to_mint, aft_shares - bef_shares)
         verify(shares_to_mint, aft_share_supply - bef_share_supply)
+
+    def test_complete_pending_deposits(self):
+        amount = 100 * 1000000
+        new_nav = 1234567
+        receivers = [self.client1, self.client2, self.client3, self.client4, self.client5]
+        self.usdc.approve(self.router, self.max_uint, fr(self.client1))
+        for i, receiver in enumerate(receivers):
+            self.router.depositRequest(self.vault, amount * (i + 1), receiver, fr(self.client1))
+        self.blacklist_policy = BlacklistPolicyManual.deploy(fr(self.admin))
+        self.vault.updateBlacklistPolicyAddress(self.blacklist_policy, fr(self.admin))
+        blacklisted = self.deposit_request_mgr.getShareHolders(0, 1)[0]
+        self.blacklist_policy.updateBlacklist(blacklisted, True, fr(self.admin))
+
+        pending = {user: self.deposit_request_mgr.balanceOf(user) for user in receivers}
+        bef_shares = {user: self.vault.balanceOf(user) for user in receivers}
+        with reverts(): self.vault.completePendingDeposits(new_nav, 0, 2, fr(self.client1))
+        with reverts(): self.vault.completePendingDeposits(new_nav, 6, 2, fr(self.admin))
+
+        # the blacklisted holder is skipped and stays below the cursor; it counts towards `maxCount`.
+        tx = self.vault.completePendingDeposits(new_nav, 0, 2, fr(self.admin))
+        verify((1, 3), tx.return_value)
+        verify(4, self.deposit_request_mgr.numberOfShareHolders())
+        tx = self.vault.completePendingDeposits(new_nav, tx.return_value[0], self.max_uint, fr(self.admin))
+        verify((1, 0), tx.return_value)
+        verify([blacklisted], list(self.deposit_request_mgr.getShareHolders(0, 1)))
+
+        for user in receivers:
+            if user == blacklisted:
+                verify(pending[user], self.deposit_request_mgr.balanceOf(user))
+                verify(bef_shares[user], self.vault.balanceOf(user))
+                continue
+            fee = pending[user] * self.onboarding_fee_pct // self.single_unit
+            verify(0, self.deposit_request_mgr.balanceOf(user))
+            verify((pending[user] - fee) * self.single_unit // new_nav, self.vault.balanceOf(user) - bef_shares[user])
+
+    def test_withdrawal_epoch(self):
+        amount = 100 * 1000000
+        new_nav = 1234567
+        receivers = [self.client1, self.client2, self.client3]
+        self.vault.manualMint(amount * len(receivers), self.client1, fr(self.admin))
+        self.vault.approve(self.router, self.max_uint, fr(self.client1))
+        for receiver in receivers:
+            self.router.withdrawRequest(self.vault, amount, receiver, fr(self.client1))
+        bef_share_supply, bef_vault_shares = self.vault.totalSupply(), self.vault.balanceOf(self.vault)
+
+        with reverts(): self.vault.processWithdrawalEpoch([[self.client1, amount]], fr(self.admin))
+        with reverts(): self.vault.closeWithdrawalEpoch(fr(self.admin))
+        with reverts(): self.vault.openWithdrawalEpoch(new_nav, fr(self.client1))
+        with reverts(): self.vault.openWithdrawalEpoch(0, fr(self.admin))
+        self.vault.openWithdrawalEpoch(new_nav, fr(self.admin))
+        verify(new_nav, self.vault.withdrawalEpochNav())
+        with reverts(): self.vault.openWithdrawalEpoch(new_nav, fr(self.admin))
+        with reverts(): self.vault.processWithdrawals(new_nav, [[self.client1, amount]], fr(self.admin))
+
+        # chunks are processed at the epoch NAV and only burnt on close.
+        with reverts(): self.vault.processWithdrawalEpoch([[self.client1, amount]], fr(self.client1))
+        self.vault.processWithdrawalEpoch([[self.client1, amount], [self.client2, amount]], fr(self.admin))
+        self.vault.completeDeposits(new_nav * 2, [], fr(self.admin))
+        tx = self.vault.processWithdrawalEpoch([[self.client3, amount]], fr(self.admin))
+        verify(amount * 3, tx.return_value)
+        verify(3, self.vault.withdrawalEpochRequests())
+        verify(bef_share_supply, self.vault.totalSupply())
+        for receiver in receivers:
+            verify(0, self.withdraw_request_mgr.balanceOf(receiver))
+            verify(amount * new_nav // self.single_unit, self.withdraw_processor.balanceOf(receiver))
+
+        with reverts(): self.vault.closeWithdrawalEpoch(fr(self.client1))
+        tx = self.vault.closeWithdrawalEpoch(fr(self.admin))
+        verify(amount * 3, tx.return_value)
+        verify(bef_share_supply - amount * 3, self.vault.totalSupply())
+        verify(bef_vault_shares - amount * 3, self.vault.balanceOf(self.vault))
+        verify(0, self.vault.withdrawalEpochNav())
+        verify(0, self.vault.withdrawalEpochShares())
+        with reverts(): self.vault.closeWithdrawalEpoch(fr(self.admin))
+
+    def test_claim_withdrawals(self):
+        amount = 100 * 1000000
+        receivers = [self.client1, self.client2, self.client3]
+        self.vault.manualMint(amount * len(receivers), self.client1, fr(self.admin))
+        self.vault.approve(self.router, self.max_uint, fr(self.client1))
+        for receiver in receivers:
+            self.router.withdrawRequest(self.vault, amount, receiver, fr(self.client1))
+        self.vault.processWithdrawals(self.single_unit, [[user, amount] for user in receivers], fr(self.admin))
+        usdc_bef = {user: self.usdc.balanceOf(user) for user in receivers}
+        fee = amount * self.withdrawal_fee_pct // self.single_unit
+
+        with reverts(): self.vault.creditWithdrawals([[user, amount] for user in receivers], fr(self.admin))
+        self.usdc.transfer(self.vault, amount * len(receivers), fr(self.usdc_source))
+        with reverts(): self.vault.creditWithdrawals([[self.client1, amount]], fr(self.client1))
+        with reverts(): self.vault.creditWithdrawals([[self.client1, amount + 1]], fr(self.admin))
+        fee_collector_bef = self.usdc.balanceOf(self.vault.withdrawalFeeCollector())
+        self.vault.creditWithdrawals([[user, amount] for user in receivers], fr(self.admin))
+        verify(fee * len(receivers), self.usdc.balanceOf(self.vault.withdrawalFeeCollector()) - fee_collector_bef)
+        verify((amount - fee) * len(receivers), self.vault.totalClaimableUsdc())
+        verify(0, self.withdraw_processor.totalSupply())
+        verify(usdc_bef, {user: self.usdc.balanceOf(user) for user in receivers})
+
+        # claimable USDC cannot be settled out.
+        with reverts(): self.vault.settlementOut(self.usdc.balanceOf(self.vault), fr(self.admin))
+
+        with reverts(): self.vault.claim(fr(self.client4))
+        tx = self.vault.claim(fr(self.client1))
+        verify(amount - fee, tx.return_value)
+        with reverts(): self.vault.claim(fr(self.client1))
+        with reverts(): self.vault.claimWithdrawals([self.client2, self.client3], fr(self.client2))
+
+        # client1 claimed ahead of the batch and client3 is blacklisted: both are skipped, client2 is still paid.
+        blacklist_policy = BlacklistPolicyManual.deploy(fr(self.admin))
+        blacklist_policy.updateBlacklist(self.client3, True, fr(self.admin))
+        self.vault.updateBlacklistPolicyAddress(blacklist_policy, fr(self.admin))
+        tx = self.vault.claimWithdrawals([self.client1, self.client2, self.client3], fr(self.admin))
+        verify(amount - fee, tx.return_value)
+        verify([(self.client2, amount - fee)], [(e["user"], e["amount"]) for e in tx.events["WithdrawalClaimed"]])
+        verify([(self.client1, 0), (self.client3, amount - fee)],
+               [(e["user"], e["amount"]) for e in tx.events["WithdrawalClaimSkipped"]])
+        with reverts("Blacklisted withdraw completion."): self.vault.claim(fr(self.client3))
+
+        blacklist_policy.updateBlacklist(self.client3, False, fr(self.admin))
+        tx = self.vault.claimWithdrawals([self.client3], fr(self.admin))
+        verify(amount - fee, tx.return_value)
+        for user in receivers:
+            verify(amount - fee, self.usdc.balanceOf(user) - usdc_bef[user])
+            verify(0, self.vault.claimableUsdc(user))
+        verify(0, self.vault.totalClaimableUsdc())
+
+    def test_batch_blacklist_policy(self):
+        self.blacklist_policy = BlacklistPolicyManual.deploy(fr(self.admin))
+        self.blacklist_policy.updateBlacklist(self.client2, True, fr(self.admin))
+        users = [self.client1, self.client2, self.client3] * 100
+        blocked = self.blacklist_policy.batchPolicy(users)
+        verify(2, len(blocked))
+        verify({i for i, user in enumerate(users) if user == self.client2},
+               {i for i in range(len(users)) if blocked[i // 256] >> (i % 256) & 1})
+        verify([0, 0], list(self.default_blacklist_policy.batchPolicy(users)))
+
+        amount = 100 * 1000000
+        self.usdc.approve(self.router, self.max_uint, fr(self.client1))
+        for receiver in [self.client1, self.client2, self.client3]:
+            self.router.depositRequest(self.vault, amount, receiver, fr(self.client1))
+        self.vault.updateBlacklistPolicyAddress(self.blacklist_policy, fr(self.admin))
+        with reverts("Blacklisted deposit request."):
+            self.vault.completeDeposits(self.single_unit, [[self.client1, amount], [self.client2, amount]],
+                                        fr(self.admin))
+        self.vault.completeDeposits(self.single_unit, [[self.client1, amount], [self.client3, amount]], fr(self.admin))
+        verify(0, self.deposit_request_mgr.balanceOf(self.client1))
+        verify(0, self.deposit_request_mgr.balanceOf(self.client3))
+        verify(amount, self.deposit_request_mgr.balanceOf(self.client2))
+        # clearing the cohort does not exempt later transfers or mints.
+        with reverts("Failed blacklist check."): self.vault.transfer(self.client2, 1, fr(self.client1))
+        with reverts("Failed blacklist check."): self.vault.manualMint(amount, self.client2, fr(self.admin))
+
+    def test_legacy_blacklist_policy(self):
+        # a policy without `batchPolicy` is asked once per user instead.
+        legacy_policy = BlacklistPolicyLegacy.deploy(fr(self.admin))
+        legacy_policy.updateBlacklist(self.client2, True, fr(self.admin))
+        amount = 100 * 1000000
+        self.usdc.approve(self.router, self.max_uint, fr(self.client1))
+        for receiver in [self.client1, self.client2, self.client3]:
+            self.router.depositRequest(self.vault, amount, receiver, fr(self.client1))
+        self.vault.updateBlacklistPolicyAddress(legacy_policy, fr(self.admin))
+        with reverts("Blacklisted deposit request."):
+            self.vault.completeDeposits(self.single_unit, [[self.client1, amount], [self.client2, amount]],
+                                        fr(self.admin))
+        self.vault.completeDeposits(self.single_unit, [[self.client1, amount]], fr(self.admin))
+        tx = self.vault.completePendingDeposits(self.single_unit, 0, self.max_uint, fr(self.admin))
+        verify((1, 0), tx.return_value)
+        verify(amount, self.deposit_request_mgr.balanceOf(self.client2))
+        verify(0, self.deposit_request_mgr.balanceOf(self.client3))
+        verify(True, self.vault.balanceOf(self.client3) > 0)
+
+        # the per-user calls get the settled amounts.
+        legacy_policy.updateMaxAssets(amount // 2, fr(self.admin))
+        self.router.depositRequest(self.vault, amount, self.client1, fr(self.client1))
+        with reverts("Blacklisted deposit request."):
+            self.vault.completeDeposits(self.single_unit, [[self.client1, amount]], fr(self.admin))
+        self.vault.completeDeposits(self.single_unit, [[self.client1, amount // 2]], fr(self.admin))
+        verify(amount // 2, self.deposit_request_mgr.balanceOf(self.client1))
+
+    def test_share_tax_exempt(self):
+        share_tax_policy = ShareTaxPolicyVanilla.deploy(self.fee_collector, self.tax_collector, int(dec("0.22e6")),
+                                                        int(dec("0.07e6")), 6, fr(self.admin))
+        share_tax_policy.updateExempt(self.withdraw_request_mgr, True, fr(self.admin))
+        share_tax_policy.updateExempt(self.router, True, fr(self.admin))
+        self.vault.updateShareTaxPolicyAddress(share_tax_policy, fr(self.admin))
+        with reverts(): self.vault.updateShareTaxExempt(self.router, True, fr(self.client1))
+        amount = 100 * 1000000
+        self.vault.manualMint(amount * 3, self.client1, fr(self.admin))
+        self.vault.approve(self.router, self.max_uint, fr(self.client1))
+
+        # the first request initialises the pending balance; the second and third compare like for like.
+        self.router.withdrawRequest(self.vault, amount, self.client1, fr(self.client1))
+        uncached = self.router.withdrawRequest(self.vault, amount, self.client1, fr(self.client1)).gas_used
+        for account in [self.router, self.withdraw_request_mgr]:
+            self.vault.updateShareTaxExempt(account, True, fr(self.admin))
+            verify(True, self.vault.shareTaxExempt(account))
+        cached = self.router.withdrawRequest(self.vault, amount, self.client1, fr(self.client1)).gas_used
+        print(f"\nwithdrawRequest: {uncached} gas asking the policy, {cached} gas with cached exemptions")
+        verify(True, cached < uncached)
+        verify(0, self.vault.balanceOf(self.client1))
+        verify(amount * 3, self.withdraw_request_mgr.balanceOf(self.client1))
+        verify(0, self.vault.balanceOf(self.fee_collector))
+        verify(0, self.vault.balanceOf(self.tax_collector))
+
+    def test_share_tax_holders(self):
+        test_phase = True
+        try: self.default_blacklist_policy.isWhitelisted(self.vault)
+        except: test_phase = False
+        if test_phase:
+            return
+
+        # the federal tax goes to the receiver, so the receiver is touched by two legs of one transfer.
+        share_tax_policy = ShareTaxPolicyVanilla.deploy(self.client2, self.tax_collector, int(dec("0.1e6")),
+                                                        int(dec("0.05e6")), 6, fr(self.admin))
+        self.vault.updateShareTaxPolicyAddress(share_tax_policy, fr(self.admin))
+        self.vault.manualMint(1000 * 1000000, self.client1, fr(self.admin))
+        self.vault.transfer(self.client2, 100 * 1000000, fr(self.client1))
+        verify(110 * 1000000, self.vault.balanceOf(self.client2))
+        verify(5 * 1000000, self.vault.balanceOf(self.tax_collector))
+        verify(3, self.vault.numberOfShareHolders())
+        verify({self.client1, self.client2, self.tax_collector},
+               set(self.vault.getShareHolders(0, self.vault.numberOfShareHolders())))
+
+        # the sender spends its whole balance and leaves the set.
+        balance = self.vault.balanceOf(self.client1)
+        amount = balance * 1000000 // 1150000
+        self.vault.transfer(self.client3, amount, fr(self.client1))
+        share_tax_policy.updateVip(self.client1, True, fr(self.admin))
+        self.vault.transfer(self.client3, self.vault.balanceOf(self.client1), fr(self.client1))
+        verify(0, self.vault.balanceOf(self.client1))
+        verify({self.client2, self.client3, self.tax_collector},
+               set(self.vault.getShareHolders(0, self.vault.numberOfShareHolders())))
+        verify(3, self.vault.numberOfShareHolders())
+
+        # a zero federal leg moves nothing and leaves the holder set as the state leg and the transfer make it.
+        share_tax_policy.updateTaxPercentage(0, fr(self.admin))
+        bef_tax_collector = self.vault.balanceOf(self.tax_collector)
+        self.vault.transfer(self.client4, 100 * 1000000, fr(self.client3))
+        verify(5 * 1000000, self.vault.balanceOf(self.tax_collector) - bef_tax_collector)
+        verify({self.client2, self.client3, self.client4, self.tax_collector},
+               set(self.vault.getShareHolders(0, self.vault.numberOfShareHolders())))
+
+    def test_share_tax_compact(self):
+        tax_pct1 = int(dec("0.1e6"))
+        tax_pct2 = int(dec("0.05e6"))
+        amount = 100 * 1000000
+        merged = ShareTaxPolicyCompact.deploy(self.tax_collector, self.tax_collector, tax_pct1, tax_pct2, 6,
+                                              fr(self.admin))
+        verify([[self.client1, self.tax_collector, amount * (tax_pct1 + tax_pct2) // 1000000]],
+               [list(leg) for leg in merged.shareTaxActions(self.client1, self.client2, amount)])
+        merged.updateTaxPercentage(0, fr(self.admin))
+        verify([[self.client1, self.tax_collector, amount * tax_pct2 // 1000000]],
+               [list(leg) for leg in merged.shareTaxActions(self.client1, self.client2, amount)])
+        merged.updateExempt(self.client2, True, fr(self.admin))
+        verify(0, len(merged.shareTaxActions(self.client1, self.client2, amount)))
+
+        split = ShareTaxPolicyCompact.deploy(self.fee_collector, self.tax_collector, tax_pct1, 0, 6, fr(self.admin))
+        verify([[self.client1, self.fee_collector, amount * tax_pct1 // 1000000]],
+               [list(leg) for leg in split.shareTaxActions(self.client1, self.client2, amount)])
+        verify(0, len(split.shareTaxActions(self.client1, self.client2, 1)))
+
+        test_phase = True
+        try: self.default_blacklist_policy.isWhitelisted(self.vault)
+        except: test_phase = False
+        if test_phase:
+            return
+
+        policy = ShareTaxPolicyCompact.deploy(self.tax_collector, self.tax_collector, tax_pct1, tax_pct2, 6,
+                                              fr(self.admin))
+        self.vault.updateShareTaxPolicyAddress(policy, fr(self.admin))
+        self.vault.manualMint(10 * amount, self.client1, fr(self.admin))
+        tx = self.vault.transfer(self.client2, amount, fr(self.client1))
+        verify(2, len(tx.events['Transfer']))
+        verify(amount, self.vault.balanceOf(self.client2))
+        verify(amount * (tax_pct1 + tax_pct2) // 1000000, self.vault.balanceOf(self.tax_collector))
+        verify({self.client1, self.client2, self.tax_collector},
+               set(self.vault.getShareHolders(0, self.vault.numberOfShareHolders())))
+
+    def test_pending_holder_gas(self):
+        # the same cohort settled through pd-USDC with the previous holder bookkeeping costs more gas.
+        legacy_vault = Vault.deploy("LEGACY FUND", "yLEGACY", self.usdc, self.dydx_delegate,
+                                    self.default_blacklist_policy, RequestManagerLegacyHolders.deploy(fr(self.admin)),
+                                    self.processor_impl, self.onboarding_fee_pct, self.withdrawal_fee_pct,
+                                    fr(self.admin))
+        legacy_vault.updateRouter(self.router, fr(self.admin))
+        self.router.authorizeVault(legacy_vault, fr(self.admin))
+        amount = 100 * 1000000
+        users = [self.client1, self.client2, self.client3, self.client4, self.client5]
+        self.usdc.approve(self.router, self.max_uint, fr(self.client1))
+
+        gas_used = []
+        for vault in [self.vault, legacy_vault]:
+            # the first cohort initialises the storage both vaults share, e.g. the router's exchange records.
+            for _ in range(2):
+                for user in users:
+                    self.router.depositRequest(vault, amount, user, fr(self.client1))
+                tx = vault.completeDeposits(self.single_unit, [[user, amount] for user in users], fr(self.admin))
+                verify(0, RequestManager.at(vault.pendingDepositUsdc()).numberOfShareHolders())
+            gas_used.append(tx.gas_used)
+        print(f"\ncompleteDeposits for {len(users)} users: {gas_used[0]} gas, {gas_used[1]} gas before")
+        verify(True, gas_used[0] < gas_used[1])
+
+    def test_vault_math_cohort(self):
+        nav = 1234567
+        users = [self.client1, self.client2, self.client3, self.client4, self.client5]
+        amounts = [random.randint(1000000, 1000 * 1000000) for _ in users]
+        self.usdc.approve(self.router, self.max_uint, fr(self.client1))
+        for user, amount in zip(users, amounts):
+            self.router.depositRequest(self.vault, amount, user, fr(self.client1))
+
+        exp_shares, exp_fees = vault_math.deposit_cohort(amounts, self.onboarding_fee_pct, nav)
+        bef_shares = [self.vault.balanceOf(user) for user in users]
+        self.vault.completeDeposits(nav, list(zip(users, amounts)), fr(self.admin))
+        verify(exp_shares, [self.vault.balanceOf(user) - bef for user, bef in zip(users, bef_shares)])
+
+        self.vault.approve(self.router, self.max_uint, fr(self.client1))
+        share_amounts = [shares // 2 + 1 for shares in exp_shares]
+        self.vault.manualMint(sum(share_amounts), self.client1, fr(self.admin))
+        for user, shares in zip(users, share_amounts):
+            self.router.withdrawRequest(self.vault, shares, user, fr(self.client1))
+        exp_pw_usdc, _ = vault_math.withdrawal_cohort(share_amounts, self.withdrawal_fee_pct, nav)
+        self.vault.processWithdrawals(nav, list(zip(users, share_amounts)), fr(self.admin))
+        verify(exp_pw_usdc, [self.withdraw_processor.balanceOf(user) for user in users])
+
+        exp_payouts, _ = vault_math.completion_cohort(exp_pw_usdc, self.withdrawal_fee_pct)
+        bef_usdc = [self.usdc.balanceOf(user) for user in users]
+        self.vault.completeWithdrawals(list(zip(users, exp_pw_usdc)), fr(self.admin))
+        verify(exp_payouts, [self.usdc.balanceOf(user) - bef for user, bef in zip(users, bef_usdc)])
@@ -1,6 +1,7 @@
 from decimal import Decimal
 import random
 from brownie import project
+from yiedl import vault_math
 
 USDC_ADDR = '0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48'
 SECS_PER_WK = 7 * 24 * 60 * 60
@@ -112,4 +113,4 @@ def verify_event(expected: [tuple], actual: [tuple]):
 
 
 def calculate_fee(pct, amount):
-    return amount * pct // 1000000
\ No newline at end of file
+    return vault_math.fee(amount, pct)
\ No newline at end of file
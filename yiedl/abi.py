@@ -0,0 +1,17 @@
+"""ABI helpers shared by the off-chain tools, compatible with eth-abi 2.x to 5.x."""
+from eth_utils import keccak
+
+try:
+    from eth_abi import decode, encode  # eth-abi >= 4
+except ImportError:
+    from eth_abi import decode_abi as decode, encode_abi as encode
+
+
+def selector(signature: str) -> bytes:
+    return keccak(text=signature)[:4]
+
+
+def to_bytes(value) -> bytes:
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith("0x") else value)
+    return bytes(value)
@@ -0,0 +1,141 @@
+"""
+Asynchronous multi-vault monitor.
+
+`VaultMonitor` enumerates the Router's authorized vaults and snapshots all of them concurrently over one pooled HTTP
+session, with the same multicall batching and snapshot layout as `yiedl.client.VaultClient`:
+
+    async with AsyncRpc(endpoint_uri, max_concurrency=16) as rpc:
+        monitor = VaultMonitor(rpc, router_address, multicall_address)
+        snapshots = await monitor.snapshot_all(users)
+        snapshots[vault]["vault"]["nav"]
+
+At most `max_concurrency` requests are in flight at a time; requests that fail with a connection error, a timeout,
+HTTP 429 or a 5xx status are retried with exponential backoff.
+"""
+import asyncio
+import itertools
+import random
+import aiohttp
+from eth_utils import to_checksum_address
+from yiedl.client import (Call, assemble_snapshot, decode_aggregate, encode_aggregate, snapshot_calls,
+                          vault_address_calls)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RpcError(Exception):
+    pass
+
+
+class AsyncRpc:
+    def __init__(self, endpoint_uri: str, max_concurrency: int = 16, retries: int = 5, backoff: float = 0.25,
+                 timeout: float = 30):
+        self.endpoint_uri = endpoint_uri
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.requests = 0
+        self._ids = itertools.count(1)
+        self._semaphore = None
+        self._session = None
+
+    async def __aenter__(self) -> "AsyncRpc":
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Keep-alive connections are reused across requests, at most one per concurrent request.
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+        self._session = None
+
+    async def request(self, method: str, params: list):
+        """Send one JSON-RPC request and return its result."""
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+        for attempt in range(self.retries + 1):
+            try:
+                async with self._semaphore:
+                    self.requests += 1
+                    async with self._session.post(self.endpoint_uri, json=payload) as response:
+                        if response.status not in RETRY_STATUSES:
+                            response.raise_for_status()
+                            body = await response.json(content_type=None)
+                            if "error" in body:
+                                raise RpcError(f"{method}: {body['error']}")
+                            return body["result"]
+                        error = RpcError(f"{method}: HTTP {response.status}")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+            if attempt == self.retries:
+                raise error
+            # Full jitter, so that requests rejected together do not retry together.
+            await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    async def block_number(self) -> int:
+        return int(await self.request("eth_blockNumber", []), 16)
+
+    async def call(self, to: str, data: str, block_identifier="latest"):
+        block = hex(block_identifier) if isinstance(block_identifier, int) else block_identifier
+        return await self.request("eth_call", [{"to": to, "data": data}, block])
+
+
+class AsyncMulticall:
+    def __init__(self, rpc: AsyncRpc, address: str, batch_size: int = 500):
+        self.rpc = rpc
+        self.address = to_checksum_address(address)
+        self.batch_size = batch_size
+
+    async def aggregate(self, calls: list, block_identifier="latest") -> (int, list):
+        """Run `calls` with every batch in flight at once; results as in `yiedl.client.Multicall.aggregate`."""
+        if block_identifier == "latest":
+            block_identifier = await self.rpc.block_number()
+        batches = [calls[start:start + self.batch_size] for start in range(0, len(calls), self.batch_size)]
+        raws = await asyncio.gather(*[self.rpc.call(self.address, encode_aggregate(batch), block_identifier)
+                                      for batch in batches])
+        values = []
+        for batch, raw in zip(batches, raws):
+            values += decode_aggregate(batch, raw)
+        return block_identifier, values
+
+
+class VaultMonitor:
+    def __init__(self, rpc: AsyncRpc, router_address: str, multicall_address: str, batch_size: int = 500):
+        self.multicall = AsyncMulticall(rpc, multicall_address, batch_size)
+        self.router = to_checksum_address(router_address)
+        self._addresses = {}
+
+    async def vaults(self, block_identifier="latest") -> list:
+        """Addresses of the Router's authorized vaults."""
+        _, (count,) = await self.multicall.aggregate(
+            [Call(self.router, "numberOfAuthorizedVaults()", "uint256")], block_identifier)
+        calls = [Call(self.router, "getAuthorizedVault(uint256)", "address", ("uint256",), (index,))
+                 for index in range(count)]
+        _, values = await self.multicall.aggregate(calls, block_identifier)
+        return [to_checksum_address(value) for value in values]
+
+    async def addresses(self, vault: str) -> dict:
+        """Addresses of a vault's token contracts, read once per vault."""
+        vault = to_checksum_address(vault)
+        if vault not in self._addresses:
+            names, calls = vault_address_calls(vault)
+            _, values = await self.multicall.aggregate(calls)
+            addresses = {"vault": vault}
+            addresses.update({name: to_checksum_address(value) for name, value in zip(names, values)})
+            self._addresses[vault] = addresses
+        return self._addresses[vault]
+
+    async def snapshot(self, vault: str, users=(), block_identifier="latest") -> dict:
+        users = [to_checksum_address(user) for user in users]
+        keys, calls = snapshot_calls(await self.addresses(vault), users)
+        block, values = await self.multicall.aggregate(calls, block_identifier)
+        return assemble_snapshot(block, users, keys, values)
+
+    async def snapshot_all(self, users=(), block_identifier="latest") -> dict:
+        """`{vault: snapshot}` for every authorized vault, all read at the same block."""
+        if block_identifier == "latest":
+            block_identifier = await self.multicall.rpc.block_number()
+        vaults = await self.vaults(block_identifier)
+        snapshots = await asyncio.gather(*[self.snapshot(vault, users, block_identifier) for vault in vaults])
+        return dict(zip(vaults, snapshots))
@@ -0,0 +1,42 @@
+"""
+Off-chain builder for `BlacklistPolicyBloom` filter updates.
+
+Hashing matches `BlacklistPolicyBloom._locate`, so a sanction list can be folded into per-word masks and loaded with a
+handful of `mergeFilterWords` calls instead of one storage write per address:
+
+    words = filter_words(addresses, policy.generation(), filter_word_bits=10)
+    for word_indexes, masks in chunks(words, 128):
+        policy.mergeFilterWords(word_indexes, masks, {"from": admin})
+"""
+from eth_utils import keccak, to_canonical_address
+
+
+def locate(address: str, generation: int, filter_word_bits: int) -> (int, int):
+    """Return the filter word index and the bit mask of `address` for `generation`."""
+    h = int.from_bytes(keccak(generation.to_bytes(32, "big") + to_canonical_address(address)), "big")
+    word_index = h & ((1 << filter_word_bits) - 1)
+    mask = (1 << ((h >> 232) & 255)) | (1 << ((h >> 240) & 255)) | (1 << ((h >> 248) & 255))
+    return word_index, mask
+
+
+def filter_words(addresses, generation: int, filter_word_bits: int) -> dict:
+    """Fold `addresses` into `{word_index: mask}`."""
+    words = {}
+    for address in addresses:
+        word_index, mask = locate(address, generation, filter_word_bits)
+        words[word_index] = words.get(word_index, 0) | mask
+    return words
+
+
+def chunks(words: dict, size: int):
+    """Yield `(word_indexes, masks)` argument pairs for `mergeFilterWords`, `size` words at a time."""
+    items = sorted(words.items())
+    for start in range(0, len(items), size):
+        batch = items[start:start + size]
+        yield [word_index for word_index, _ in batch], [mask for _, mask in batch]
+
+
+def false_positive_rate(words: dict, filter_word_bits: int) -> float:
+    """Expected probability that an address outside the list hits all three of its bits."""
+    total_words = 1 << filter_word_bits
+    return sum((bin(mask).count("1") / 256) ** 3 for mask in words.values()) / total_words
@@ -0,0 +1,142 @@
+"""
+Vault client with multicall-batched reads.
+
+`VaultClient.snapshot` reads supplies, NAV, fees, holder counts and per-user balances of a vault and its pending
+tokens through `contracts/Multicall.sol`, in one `eth_call` per `batch_size` reads:
+
+    client = VaultClient(web3, vault_address, multicall_address)
+    snapshot = client.snapshot(users)
+    snapshot["vault"]["nav"], snapshot["users"][user]["pending_deposit_usdc"]
+"""
+from typing import NamedTuple
+from eth_utils import to_checksum_address
+from yiedl.abi import decode, encode, selector, to_bytes
+
+AGGREGATE = selector("aggregate((address,bytes)[])")
+
+VAULT_FIELDS = {
+    "total_supply": ("totalSupply()", "uint256"),
+    "nav": ("nav()", "uint256"),
+    "onboarding_fee_percentage": ("onboardingFeePercentage()", "uint256"),
+    "withdrawal_fee_percentage": ("withdrawalFeePercentage()", "uint256"),
+    "number_of_share_holders": ("numberOfShareHolders()", "uint256"),
+    "total_claimable_usdc": ("totalClaimableUsdc()", "uint256"),
+    "withdrawal_epoch_nav": ("withdrawalEpochNav()", "uint256"),
+}
+PENDING_FIELDS = {
+    "total_supply": ("totalSupply()", "uint256"),
+    "number_of_share_holders": ("numberOfShareHolders()", "uint256"),
+}
+# Token contracts read for every user, keyed by the snapshot field they fill.
+USER_TOKENS = ["usdc", "vault", "pending_deposit_usdc", "pending_withdraw_share", "pending_withdraw_usdc"]
+
+
+class Call(NamedTuple):
+    target: str
+    signature: str
+    return_type: str
+    arg_types: tuple = ()
+    args: tuple = ()
+
+    def call_data(self) -> bytes:
+        return selector(self.signature) + (encode(list(self.arg_types), list(self.args)) if self.arg_types else b"")
+
+
+def encode_aggregate(calls: list) -> str:
+    """Call data for `Multicall.aggregate(calls)`."""
+    data = AGGREGATE + encode(["(address,bytes)[]"], [[(call.target, call.call_data()) for call in calls]])
+    return "0x" + data.hex()
+
+
+def decode_aggregate(calls: list, raw) -> list:
+    """Decoded `Multicall.aggregate` results for `calls`, None for calls that failed."""
+    _, results = decode(["uint256", "(bool,bytes)[]"], to_bytes(raw))
+    return [decode([call.return_type], return_data)[0] if success else None
+            for call, (success, return_data) in zip(calls, results)]
+
+
+def vault_address_calls(vault: str) -> (list, list):
+    fields = {
+        "usdc": "usdcToken()",
+        "pending_deposit_usdc": "pendingDepositUsdc()",
+        "pending_withdraw_share": "pendingWithdrawShare()",
+        "pending_withdraw_usdc": "pendingWithdrawUsdc()",
+    }
+    return list(fields), [Call(vault, signature, "address") for signature in fields.values()]
+
+
+def snapshot_calls(addresses: dict, users: list) -> (list, list):
+    """The reads of a vault snapshot, and the path in the snapshot each result is stored at."""
+    vault = addresses["vault"]
+    calls, keys = [], []
+
+    def add(key, call):
+        keys.append(key)
+        calls.append(call)
+
+    for name, (signature, return_type) in VAULT_FIELDS.items():
+        add(("vault", name), Call(vault, signature, return_type))
+    for token in ["pending_deposit_usdc", "pending_withdraw_share", "pending_withdraw_usdc"]:
+        for name, (signature, return_type) in PENDING_FIELDS.items():
+            add((token, name), Call(addresses[token], signature, return_type))
+    add(("vault", "usdc_balance"), Call(addresses["usdc"], "balanceOf(address)", "uint256", ("address",), (vault,)))
+    for user in users:
+        for token in USER_TOKENS:
+            add(("users", user, token), Call(addresses[token], "balanceOf(address)", "uint256", ("address",), (user,)))
+        add(("users", user, "claimable_usdc"), Call(vault, "claimableUsdc(address)", "uint256", ("address",), (user,)))
+    return keys, calls
+
+
+def assemble_snapshot(block: int, users: list, keys: list, values: list) -> dict:
+    snapshot = {"block": block, "vault": {}, "pending_deposit_usdc": {}, "pending_withdraw_share": {},
+                "pending_withdraw_usdc": {}, "users": {user: {} for user in users}}
+    for key, value in zip(keys, values):
+        node = snapshot
+        for part in key[:-1]:
+            node = node[part]
+        node[key[-1]] = value
+    return snapshot
+
+
+class Multicall:
+    def __init__(self, web3, address: str, batch_size: int = 500):
+        self.web3 = web3
+        self.address = to_checksum_address(address)
+        self.batch_size = batch_size
+        self.eth_calls = 0
+
+    def aggregate(self, calls: list, block_identifier="latest") -> (int, list):
+        """Run `calls` and return the block number and the decoded results (None for calls that failed)."""
+        if block_identifier == "latest":
+            # Pin every batch to one block so that a multi-batch snapshot is consistent.
+            block_identifier = self.web3.eth.block_number
+        values = []
+        for start in range(0, len(calls), self.batch_size):
+            batch = calls[start:start + self.batch_size]
+            raw = self.web3.eth.call({"to": self.address, "data": encode_aggregate(batch)}, block_identifier)
+            self.eth_calls += 1
+            values += decode_aggregate(batch, raw)
+        return block_identifier, values
+
+
+class VaultClient:
+    def __init__(self, web3, vault_address: str, multicall_address: str, batch_size: int = 500):
+        self.multicall = Multicall(web3, multicall_address, batch_size)
+        self.vault = to_checksum_address(vault_address)
+        self._addresses = None
+
+    @property
+    def addresses(self) -> dict:
+        """Addresses of the vault's token contracts, read once."""
+        if self._addresses is None:
+            names, calls = vault_address_calls(self.vault)
+            _, values = self.multicall.aggregate(calls)
+            self._addresses = {"vault": self.vault}
+            self._addresses.update({name: to_checksum_address(value) for name, value in zip(names, values)})
+        return self._addresses
+
+    def snapshot(self, users=(), block_identifier="latest") -> dict:
+        users = [to_checksum_address(user) for user in users]
+        keys, calls = snapshot_calls(self.addresses, users)
+        block, values = self.multicall.aggregate(calls, block_identifier)
+        return assemble_snapshot(block, users, keys, values)
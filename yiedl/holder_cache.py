@@ -0,0 +1,156 @@
+"""
+Event-driven holder and balance cache for the vault's pending tokens.
+
+`HolderCache` seeds `{holder: balance}` once from `getShareHoldersWithBalances` and then follows `Transfer` logs, so
+settlement prep reads the cache instead of re-scanning every holder:
+
+    cache = HolderCache(web3, [vault.pendingDepositUsdc(), vault.pendingWithdrawShare(), vault.pendingWithdrawUsdc()])
+    cache.sync()                                   # seeds on the first call, then once per block / cycle
+    pending = cache.balances(vault.pendingDepositUsdc())
+    plan_deposits(pending, ...)
+
+The last `reorg_depth` blocks are journaled with their hashes. When a synced block's hash changes, its transfers are
+undone and the blocks are applied again; a reorg deeper than the journal reseeds from chain. `check` compares holder
+counts and supplies against `numberOfShareHolders` and `totalSupply`.
+"""
+from collections import deque
+from eth_utils import keccak, to_checksum_address
+from yiedl.abi import decode, encode, selector, to_bytes
+
+TRANSFER_TOPIC = keccak(text="Transfer(address,address,uint256)")
+ZERO_ADDRESS = "0x" + "00" * 20
+
+
+def _topic_address(topic) -> str:
+    return to_checksum_address(to_bytes(topic)[-20:])
+
+
+class ReorgTooDeep(Exception):
+    pass
+
+
+class HolderCache:
+    def __init__(self, web3, tokens: list, reorg_depth: int = 12, page_size: int = 500, batch_size: int = 5000):
+        self.web3 = web3
+        self.tokens = [to_checksum_address(token) for token in tokens]
+        self.reorg_depth = reorg_depth
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.last_block = None
+        self._balances = {token: {} for token in self.tokens}
+        # (block number, block hash, [(token, holder, delta), ...]) for the last `reorg_depth` synced blocks.
+        self._journal = deque()
+
+    def balances(self, token: str) -> dict:
+        """`{holder: balance}` of `token` as of `last_block`; every balance is non-zero."""
+        return dict(self._balances[to_checksum_address(token)])
+
+    def holders(self, token: str) -> set:
+        return set(self._balances[to_checksum_address(token)])
+
+    def seed(self, block_number: int = None):
+        """Read every holder and balance at `block_number` (default: latest), dropping the journal."""
+        if block_number is None:
+            block_number = self.web3.eth.block_number
+        for token in self.tokens:
+            balances, cursor = {}, 0
+            total = self._call(token, "numberOfShareHolders()", ["uint256"], [], [], block_number)[0]
+            while cursor < total:
+                holders, amounts, cursor = self._call(
+                    token, "getShareHoldersWithBalances(uint256,uint256)", ["address[]", "uint256[]", "uint256"],
+                    ["uint256", "uint256"], [cursor, self.page_size], block_number)
+                balances.update((to_checksum_address(holder), amount) for holder, amount in zip(holders, amounts))
+            self._balances[token] = balances
+        self.last_block = block_number
+        self._journal.clear()
+        self._journal.append((block_number, self._block_hash(block_number), []))
+
+    def sync(self, to_block: int = None) -> int:
+        """Follow the chain up to `to_block` (default: latest) and return the number of transfers applied."""
+        if self.last_block is None:
+            self.seed(to_block)
+            return 0
+        head = self.web3.eth.block_number
+        to_block = head if to_block is None else to_block
+        try:
+            self._rollback(head)
+        except ReorgTooDeep:
+            self.seed(to_block)
+            return 0
+        applied = 0
+        # Blocks deeper than `reorg_depth` are final: read them by range and keep no journal for them.
+        final_block = min(to_block, head - self.reorg_depth)
+        while self.last_block < final_block:
+            end_block = min(self.last_block + self.batch_size, final_block)
+            applied += self._apply_logs(self._get_logs({"fromBlock": self.last_block + 1, "toBlock": end_block}))
+            self.last_block = end_block
+            self._journal.clear()
+            self._journal.append((end_block, self._block_hash(end_block), []))
+        for block_number in range(self.last_block + 1, to_block + 1):
+            block_hash = self._block_hash(block_number)
+            deltas = []
+            applied += self._apply_logs(self._get_logs({"blockHash": "0x" + block_hash.hex()}), deltas)
+            self._journal.append((block_number, block_hash, deltas))
+            while len(self._journal) > self.reorg_depth:
+                self._journal.popleft()
+            self.last_block = block_number
+        return applied
+
+    def check(self, block_number: int = None) -> list:
+        """
+        Compare the cache with the tokens at `last_block` (or `block_number` once synced there).
+        Return the tokens whose holder count or total supply disagree; an empty list means the cache is consistent.
+        """
+        block_number = self.last_block if block_number is None else block_number
+        mismatched = []
+        for token in self.tokens:
+            holders = self._call(token, "numberOfShareHolders()", ["uint256"], [], [], block_number)[0]
+            supply = self._call(token, "totalSupply()", ["uint256"], [], [], block_number)[0]
+            balances = self._balances[token]
+            if holders != len(balances) or supply != sum(balances.values()):
+                mismatched.append(token)
+        return mismatched
+
+    def _get_logs(self, block_filter: dict) -> list:
+        logs = self.web3.eth.get_logs({"address": self.tokens, "topics": ["0x" + TRANSFER_TOPIC.hex()], **block_filter})
+        return sorted(logs, key=lambda l: (l["blockNumber"], l["logIndex"]))
+
+    def _apply_logs(self, logs: list, deltas: list = None) -> int:
+        for log in logs:
+            token = to_checksum_address(log["address"])
+            sender, receiver = (_topic_address(topic) for topic in log["topics"][1:3])
+            (amount,) = decode(["uint256"], to_bytes(log["data"]))
+            for holder, delta in [(sender, -amount), (receiver, amount)]:
+                if holder != ZERO_ADDRESS and amount:
+                    self._adjust(token, holder, delta)
+                    if deltas is not None:
+                        deltas.append((token, holder, delta))
+        return len(logs)
+
+    def _rollback(self, head: int):
+        """Undo journaled blocks that are no longer canonical."""
+        while self._journal:
+            block_number, block_hash, deltas = self._journal[-1]
+            if block_number <= head and self._block_hash(block_number) == block_hash:
+                return
+            for token, holder, delta in reversed(deltas):
+                self._adjust(token, holder, -delta)
+            self._journal.pop()
+            self.last_block = block_number - 1
+        raise ReorgTooDeep(f"Reorg deeper than {self.reorg_depth} blocks.")
+
+    def _adjust(self, token: str, holder: str, delta: int):
+        balances = self._balances[token]
+        balance = balances.get(holder, 0) + delta
+        if balance:
+            balances[holder] = balance
+        else:
+            balances.pop(holder, None)
+
+    def _block_hash(self, block_number: int) -> bytes:
+        return to_bytes(self.web3.eth.get_block(block_number)["hash"])
+
+    def _call(self, token: str, signature: str, return_types: list, arg_types: list, args: list, block_number: int):
+        data = selector(signature) + (encode(arg_types, args) if arg_types else b"")
+        raw = self.web3.eth.call({"to": token, "data": "0x" + data.hex()}, block_number)
+        return decode(return_types, to_bytes(raw))
@@ -0,0 +1,139 @@
+"""
+Off-chain store for Router history.
+
+The Router emits every request and settlement as a `RequestRecorded` / `ProcessedRecorded` event, and only keeps them
+in storage while `recordsInStorage` is set. `RouterIndexer` rebuilds the per-user record lists that `Router.getRecords`
+returns from those logs into a SQLite database:
+
+    indexer = RouterIndexer(router.address, "records.db", start_block=deployment_block)
+    indexer.sync(web3)
+    requests, processed = indexer.get_records(user)
+"""
+import sqlite3
+from eth_utils import keccak, to_checksum_address
+from yiedl.abi import decode as abi_decode, to_bytes as _to_bytes
+
+REQUEST_RECORDED = "RequestRecorded(address,address,address,uint8,uint256,uint256)"
+PROCESSED_RECORDED = "ProcessedRecorded(address,address,uint8,address,uint256,uint256,uint256,uint256)"
+REQUEST_TOPIC = keccak(text=REQUEST_RECORDED)
+PROCESSED_TOPIC = keccak(text=PROCESSED_RECORDED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS request_records (
+    user TEXT NOT NULL, block_number INTEGER NOT NULL, log_index INTEGER NOT NULL,
+    vault TEXT NOT NULL, request_type INTEGER NOT NULL, sender TEXT NOT NULL, receiver TEXT NOT NULL,
+    timestamp INTEGER NOT NULL, amount TEXT NOT NULL,
+    PRIMARY KEY (user, block_number, log_index)
+);
+CREATE TABLE IF NOT EXISTS processed_records (
+    user TEXT NOT NULL, block_number INTEGER NOT NULL, log_index INTEGER NOT NULL,
+    vault TEXT NOT NULL, request_type INTEGER NOT NULL, receiver TEXT NOT NULL,
+    timestamp INTEGER NOT NULL, amount_in TEXT NOT NULL, amount_out TEXT NOT NULL, fees_paid TEXT NOT NULL,
+    PRIMARY KEY (user, block_number, log_index)
+);
+"""
+
+
+def _topic_address(topic) -> str:
+    return to_checksum_address(_to_bytes(topic)[-20:])
+
+
+class RouterIndexer:
+    def __init__(self, router_address: str, db_path: str = ":memory:", start_block: int = 0):
+        self.router_address = to_checksum_address(router_address)
+        self.db = sqlite3.connect(db_path)
+        self.db.executescript(SCHEMA)
+        if self._meta("router") is None:
+            self._set_meta("router", self.router_address)
+            self._set_meta("last_block", start_block - 1)
+            self.db.commit()
+        elif self._meta("router") != self.router_address:
+            raise ValueError(f"{db_path} indexes router {self._meta('router')}, not {self.router_address}.")
+
+    @property
+    def last_block(self) -> int:
+        return int(self._meta("last_block"))
+
+    def sync(self, web3, to_block: int = None, batch_size: int = 5000) -> int:
+        """Index all Router logs up to `to_block` (default: latest) and return the number of logs applied."""
+        if to_block is None:
+            to_block = web3.eth.block_number
+        applied = 0
+        from_block = self.last_block + 1
+        while from_block <= to_block:
+            end_block = min(from_block + batch_size - 1, to_block)
+            logs = web3.eth.get_logs({
+                "address": self.router_address,
+                "fromBlock": from_block,
+                "toBlock": end_block,
+                "topics": [["0x" + REQUEST_TOPIC.hex(), "0x" + PROCESSED_TOPIC.hex()]],
+            })
+            for log in sorted(logs, key=lambda l: (l["blockNumber"], l["logIndex"])):
+                applied += self.apply_log(log)
+            self._set_meta("last_block", end_block)
+            self.db.commit()
+            from_block = end_block + 1
+        return applied
+
+    def apply_log(self, log) -> int:
+        topics = [_to_bytes(topic) for topic in log["topics"]]
+        block_number, log_index = log["blockNumber"], log["logIndex"]
+        data = _to_bytes(log["data"])
+        if topics[0] == REQUEST_TOPIC:
+            vault, sender, receiver = (_topic_address(topic) for topic in topics[1:4])
+            request_type, timestamp, amount = abi_decode(["uint8", "uint256", "uint256"], data)
+            # Same fan-out as Router._recordRequest: the record belongs to both sender and receiver.
+            for user in {sender, receiver}:
+                self.db.execute(
+                    "INSERT OR IGNORE INTO request_records VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (user, block_number, log_index, vault, request_type, sender, receiver, timestamp, str(amount))
+                )
+            return 1
+        if topics[0] == PROCESSED_TOPIC:
+            user, vault = _topic_address(topics[1]), _topic_address(topics[2])
+            request_type, receiver, timestamp, amount_in, amount_out, fees_paid = abi_decode(
+                ["uint8", "address", "uint256", "uint256", "uint256", "uint256"], data
+            )
+            self.db.execute(
+                "INSERT OR IGNORE INTO processed_records VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (user, block_number, log_index, vault, request_type, to_checksum_address(receiver), timestamp,
+                 str(amount_in), str(amount_out), str(fees_paid))
+            )
+            return 1
+        return 0
+
+    def number_of_records(self, user: str) -> (int, int):
+        user = to_checksum_address(user)
+        requests = self.db.execute("SELECT COUNT(*) FROM request_records WHERE user = ?", (user,)).fetchone()[0]
+        processed = self.db.execute("SELECT COUNT(*) FROM processed_records WHERE user = ?", (user,)).fetchone()[0]
+        return requests, processed
+
+    def get_records(self, user: str) -> (list, list):
+        """Return `user`'s records in the same shape and order as `Router.getRecords`."""
+        user = to_checksum_address(user)
+        requests = [
+            [vault, request_type, sender, receiver, timestamp, int(amount)]
+            for vault, request_type, sender, receiver, timestamp, amount in self.db.execute(
+                "SELECT vault, request_type, sender, receiver, timestamp, amount FROM request_records "
+                "WHERE user = ? ORDER BY block_number, log_index", (user,)
+            )
+        ]
+        processed = [
+            [vault, request_type, receiver, timestamp, int(amount_in), int(amount_out), int(fees_paid)]
+            for vault, request_type, receiver, timestamp, amount_in, amount_out, fees_paid in self.db.execute(
+                "SELECT vault, request_type, receiver, timestamp, amount_in, amount_out, fees_paid "
+                "FROM processed_records WHERE user = ? ORDER BY block_number, log_index", (user,)
+            )
+        ]
+        return requests, processed
+
+    def close(self):
+        self.db.close()
+
+    def _meta(self, key: str):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def _set_meta(self, key: str, value):
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
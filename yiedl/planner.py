@@ -0,0 +1,135 @@
+"""
+Settlement planner: picks which pending holders to settle and packs them into transactions under a gas ceiling.
+
+    model = GasModel.from_report("reports/gas_benchmark.json", "completeDeposits")
+    pending = pending_balances(vault_pending_deposit_usdc)
+    batches = plan_deposits(pending, liquidity=delegate_usdc, gas_model=model, gas_ceiling=15_000_000)
+    for batch in batches:
+        vault.completeDeposits(nav, batch, {"from": admin})
+
+Deposits and withdrawal completions are limited by liquidity (USDC on the trading venue and in the vault
+respectively); `processWithdrawals` only by gas. Each plan returns `[[user, amount], ...]` batches in the calldata
+shape of the Vault settlement functions.
+"""
+import json
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class GasModel:
+    fixed: int
+    per_user: int
+
+    def __post_init__(self):
+        if self.per_user <= 0:
+            raise ValueError(f"Gas per user must be positive, got {self.per_user}.")
+
+    @classmethod
+    def from_report(cls, path: str, function: str) -> "GasModel":
+        """Calibrate from a `benchmarks/test_gas_benchmark.py` report."""
+        with open(path) as f:
+            summary = json.load(f)["summary"][function]
+        if summary["fixed_gas"] is None or summary["marginal_gas_per_user"] is None:
+            raise ValueError(f"{path} has no gas fit for {function}.")
+        return cls(max(summary["fixed_gas"], 0), summary["marginal_gas_per_user"])
+
+    def gas(self, users: int) -> int:
+        return self.fixed + self.per_user * users
+
+    def max_users(self, gas_ceiling: int) -> int:
+        users = (gas_ceiling - self.fixed) // self.per_user
+        if users < 1:
+            raise ValueError(f"Gas ceiling {gas_ceiling} does not fit a single user.")
+        return users
+
+
+def pending_balances(token, page_size: int = 500) -> dict:
+    """Read `{holder: balance}` from a pending token through `getShareHoldersWithBalances`."""
+    balances, cursor = {}, 0
+    total = token.numberOfShareHolders()
+    while cursor < total:
+        holders, amounts, cursor = token.getShareHoldersWithBalances(cursor, page_size)
+        balances.update(zip(holders, amounts))
+    return balances
+
+
+def _first_fit(items: list, liquidity: int) -> (list, int):
+    selected, remaining = [], liquidity
+    for amount, user in items:
+        if amount <= remaining:
+            selected.append([user, amount])
+            remaining -= amount
+    return selected, remaining
+
+
+def select_within(pending: dict, liquidity: int, allow_partial: bool = True, restarts: int = 16) -> list:
+    """
+    Choose `[user, amount]` settlements whose total is as close to `liquidity` as possible.
+
+    With `allow_partial`, holders are filled largest first and the last one is settled partially, so no liquidity is
+    left over. Otherwise whole balances are packed first-fit decreasing, starting from each of the `restarts` largest
+    holders in turn, and single swaps of a selected holder for a larger unselected one close the remaining gap.
+    """
+    items = sorted(((amount, user) for user, amount in pending.items() if amount > 0), reverse=True)
+    if allow_partial:
+        selected, remaining = [], liquidity
+        for amount, user in items:
+            if remaining == 0:
+                break
+            selected.append([user, min(amount, remaining)])
+            remaining -= min(amount, remaining)
+        return selected
+
+    selected, remaining = None, None
+    for start in range(min(len(items), restarts) or 1):
+        candidate, candidate_remaining = _first_fit(items[start:] + items[:start], liquidity)
+        if remaining is None or candidate_remaining < remaining:
+            selected, remaining = candidate, candidate_remaining
+        if remaining == 0:
+            return selected
+
+    chosen = {user for user, _ in selected}
+    unselected = [(amount, user) for amount, user in items if user not in chosen]
+    improved = True
+    while improved and remaining > 0:
+        improved = False
+        best = None
+        for index, (user, amount) in enumerate(selected):
+            for other_amount, other_user in unselected:
+                gain = other_amount - amount
+                if 0 < gain <= remaining and (best is None or gain > best[0]):
+                    best = (gain, index, other_user, other_amount)
+        if best is not None:
+            gain, index, other_user, other_amount = best
+            old_user, old_amount = selected[index]
+            selected[index] = [other_user, other_amount]
+            unselected.remove((other_amount, other_user))
+            unselected.append((old_amount, old_user))
+            remaining -= gain
+            improved = True
+    return selected
+
+
+def pack(settlements: list, gas_model: GasModel, gas_ceiling: int) -> list:
+    """Split settlements into batches of as many users as fit under `gas_ceiling`; only the last one is smaller."""
+    if not settlements:
+        return []
+    max_users = gas_model.max_users(gas_ceiling)
+    return [settlements[start:start + max_users] for start in range(0, len(settlements), max_users)]
+
+
+def plan_deposits(pending: dict, liquidity: int, gas_model: GasModel, gas_ceiling: int,
+                  allow_partial: bool = True) -> list:
+    """`completeDeposits` batches settling up to `liquidity` USDC of pd-USDC balances."""
+    return pack(select_within(pending, liquidity, allow_partial), gas_model, gas_ceiling)
+
+
+def plan_withdrawal_processing(pending: dict, gas_model: GasModel, gas_ceiling: int) -> list:
+    """`processWithdrawals` batches for every pending withdrawal share balance."""
+    settlements = [[user, amount] for user, amount in sorted(pending.items(), key=lambda item: -item[1]) if amount > 0]
+    return pack(settlements, gas_model, gas_ceiling)
+
+
+def plan_withdrawal_completions(pending: dict, liquidity: int, gas_model: GasModel, gas_ceiling: int) -> list:
+    """`completeWithdrawals` batches paying out up to `liquidity` USDC of pw-USDC balances."""
+    return pack(select_within(pending, liquidity, allow_partial=True), gas_model, gas_ceiling)
@@ -0,0 +1,56 @@
+"""
+Python reference for `contracts/VaultMath.sol`.
+
+Every function rounds exactly like the contract. The cohort helpers compute a whole batch in one call and accept any
+sequence of amounts, including NumPy arrays; results are exact Python ints because uint256 products overflow int64.
+
+    shares, fees = deposit_cohort(amounts, onboarding_fee_percentage, nav)
+"""
+SINGLE_UNIT = 10 ** 6
+
+
+def fee(amount: int, fee_percentage: int) -> int:
+    return amount * fee_percentage // SINGLE_UNIT
+
+
+def usdc_to_shares(usdc_amount: int, nav: int) -> int:
+    return usdc_amount * SINGLE_UNIT // nav
+
+
+def shares_to_usdc(share_amount: int, nav: int) -> int:
+    return share_amount * nav // SINGLE_UNIT
+
+
+def net_of_fee(amount: int, fee_percentage: int) -> (int, int):
+    fee_amount = fee(amount, fee_percentage)
+    return amount - fee_amount, fee_amount
+
+
+def deposit_out(usdc_in: int, fee_percentage: int, nav: int) -> (int, int):
+    net, fee_amount = net_of_fee(usdc_in, fee_percentage)
+    return usdc_to_shares(net, nav), fee_amount
+
+
+def _ints(amounts) -> list:
+    return [int(amount) for amount in amounts]
+
+
+def deposit_cohort(usdc_amounts, fee_percentage: int, nav: int) -> (list, list):
+    """Shares minted and onboarding fees for each amount settled by `completeDeposits`."""
+    amounts = _ints(usdc_amounts)
+    fees = [fee(amount, fee_percentage) for amount in amounts]
+    shares = [usdc_to_shares(amount - fee_amount, nav) for amount, fee_amount in zip(amounts, fees)]
+    return shares, fees
+
+
+def withdrawal_cohort(share_amounts, fee_percentage: int, nav: int) -> (list, list):
+    """pw-USDC minted and the withdrawal fee recorded for each amount processed by `processWithdrawals`."""
+    pw_usdc = [shares_to_usdc(amount, nav) for amount in _ints(share_amounts)]
+    fees = [fee(amount, fee_percentage) for amount in pw_usdc]
+    return pw_usdc, fees
+
+
+def completion_cohort(pw_usdc_amounts, fee_percentage: int) -> (list, list):
+    """USDC paid out and withdrawal fees for each amount settled by `completeWithdrawals`."""
+    settlements = [net_of_fee(amount, fee_percentage) for amount in _ints(pw_usdc_amounts)]
+    return [net for net, _ in settlements], [fee_amount for _, fee_amount in settlements]